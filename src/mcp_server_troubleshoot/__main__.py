@@ -14,7 +14,7 @@ from typing import List, Optional
 
 from .server import mcp, shutdown
 from .config import get_recommended_client_config
-from .lifecycle import setup_signal_handlers
+from .lifecycle import setup_event_loop_policy, setup_signal_handlers
 
 logger = logging.getLogger(__name__)
 
@@ -148,6 +148,7 @@ def main(args: Optional[List[str]] = None) -> None:
     # Run the FastMCP server - this handles stdin/stdout automatically
     try:
         logger.debug("Starting FastMCP server")
+        setup_event_loop_policy()
         mcp.run()
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
@@ -7,16 +7,23 @@ extraction, initialization, and cleanup.
 """
 
 import asyncio
+import gzip
+import io
+import itertools
 import json
 import logging
 import os
 import re
 import shutil
 import signal
+import stat
 import tarfile
 import tempfile
-from pathlib import Path
-from typing import List, Optional, Tuple, Union
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path, PurePath
+from typing import AsyncIterator, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import aiohttp
@@ -30,6 +37,7 @@ logger = logging.getLogger(__name__)
 DEFAULT_DOWNLOAD_SIZE = 1024 * 1024 * 1024  # 1 GB
 DEFAULT_DOWNLOAD_TIMEOUT = 300  # 5 minutes
 DEFAULT_INITIALIZATION_TIMEOUT = 120  # 2 minutes
+DOWNLOAD_CHUNK_SIZE = 256 * 1024  # Bytes read from the response per write while downloading
 
 # Feature flags - can be enabled/disabled via environment variables
 DEFAULT_CLEANUP_ORPHANED = True  # Clean up orphaned sbctl processes
@@ -76,10 +84,124 @@ logger.debug(f"Using MAX_INITIALIZATION_TIMEOUT: {MAX_INITIALIZATION_TIMEOUT} se
 logger.debug(f"Feature flags - Cleanup orphaned processes: {CLEANUP_ORPHANED}")
 logger.debug(f"Feature flags - Allow alternative kubeconfig: {ALLOW_ALTERNATIVE_KUBECONFIG}")
 
+# Constants for peeking inside bundle archives
+GZIP_MAGIC = b"\x1f\x8b"
+TAR_BLOCK_SIZE = 512
+MIN_BUNDLE_SIZE = 50  # Smaller files cannot hold a gzip header plus an empty tar archive
+BUNDLE_PROBE_MEMBERS = 20  # Number of archive members inspected when validating a bundle
+BUNDLE_VALIDITY_CACHE_SIZE = 512  # Number of validity results remembered per manager
+
+# Tar member types whose headers only describe the following member (GNU long
+# names and pax extended headers); they need the full tarfile parser
+_TAR_EXTENSION_TYPES = frozenset(b"LKxgX")
+
+
+def _extract_bundle_archive(bundle_path: Path, extract_dir: Path) -> int:
+    """
+    Extract a bundle archive in a single pass over the compressed stream.
+
+    Members are extracted as they are read, so the archive is decompressed
+    once instead of being indexed first and then read again for extraction.
+    Absolute paths and parent directory traversal are reduced to the base name.
+
+    Args:
+        bundle_path: Path to the .tar.gz or .tgz file
+        extract_dir: Directory to extract the bundle into
+
+    Returns:
+        The number of archive members
+    """
+    member_count = 0
+
+    def safe_members(tar: tarfile.TarFile) -> Iterator[tarfile.TarInfo]:
+        nonlocal member_count
+        for member in tar:
+            member_count += 1
+            # Make path safe by removing absolute paths and parent dir traversal
+            if member.name.startswith(("/", "../")):
+                member.name = PurePath(member.name).name
+            yield member
+
+    with tarfile.open(bundle_path, mode="r|gz") as tar:
+        # Use filter='data' to only extract file data without modifying metadata
+        tar.extractall(path=extract_dir, members=safe_members(tar), filter="data")
+
+    return member_count
+
+
+def _is_support_bundle_member(name: str) -> bool:
+    """
+    Check whether an archive member name indicates a support bundle.
+
+    Bundles hold the common cluster-resources directory or a top-level
+    support-bundle directory.
+
+    Args:
+        name: The archive member name
+
+    Returns:
+        True if the member belongs to a support bundle layout
+    """
+    return "cluster-resources/" in name or name.startswith("support-bundle-")
+
+
+def _read_tar_member_names(stream: io.BufferedIOBase, limit: int) -> Optional[List[str]]:
+    """
+    Read the names of the first members of an uncompressed tar stream.
+
+    Only the 512-byte member headers are parsed; member data is skipped over.
+    This avoids the member bookkeeping of the tarfile module when all that is
+    needed is a look at the first few names.
+
+    Args:
+        stream: The uncompressed tar stream, positioned at the first header
+        limit: The maximum number of member names to read
+
+    Returns:
+        The member names in archive order, or None if the headers cannot be
+        understood without the tarfile module (extended headers, a bad checksum,
+        or a truncated archive)
+    """
+    names: List[str] = []
+    while len(names) < limit:
+        header = stream.read(TAR_BLOCK_SIZE)
+        if len(header) < TAR_BLOCK_SIZE:
+            return None
+        if not any(header):
+            # A zero block marks the end of the archive
+            break
+
+        # The checksum is the byte sum of the header with the checksum field as spaces
+        try:
+            checksum = int(header[148:156].split(b"\0", 1)[0].strip() or b"0", 8)
+            size = int(header[124:136].split(b"\0", 1)[0].strip() or b"0", 8)
+        except ValueError:
+            return None
+        if checksum != sum(header[:148]) + 8 * 0x20 + sum(header[156:]):
+            return None
+        if header[156] in _TAR_EXTENSION_TYPES:
+            return None
+
+        name = header[:100].split(b"\0", 1)[0].decode("utf-8", "replace")
+        if header[257:263] == b"ustar\0":
+            # POSIX ustar splits long paths into a prefix and a name
+            prefix = header[345:500].split(b"\0", 1)[0].decode("utf-8", "replace")
+            if prefix:
+                name = f"{prefix}/{name}"
+        names.append(name)
+
+        # Skip the member data, which is padded to whole blocks
+        stream.seek((size + TAR_BLOCK_SIZE - 1) // TAR_BLOCK_SIZE * TAR_BLOCK_SIZE, io.SEEK_CUR)
+
+    return names
+
+
 # Constants for Replicated Vendor Portal integration
 REPLICATED_VENDOR_URL_PATTERN = re.compile(
     r"https://vendor\.replicated\.com/troubleshoot/analyze/([^/]+)"
 )
+# Characters replaced with "_" when deriving download file names from URLs
+UNSAFE_FILENAME_CHARS_PATTERN = re.compile(r"[^\w\-.]")
 # Ensure there is NO space between 'v' and '3'
 REPLICATED_API_ENDPOINT = "https://api.replicated.com/vendor/v3/supportbundle/{slug}"
 
@@ -226,6 +348,15 @@ class BundleManager:
         self.sbctl_process: Optional[asyncio.subprocess.Process] = None
         self._host_only_bundle: bool = False
         self._termination_requested: bool = False
+        # Bundle validity results keyed by (path, mtime_ns, size), least recently used first;
+        # bundles are validated in worker threads, so access goes through the lock
+        self._validity_cache: OrderedDict[Tuple[str, int, int], Tuple[bool, Optional[str]]] = (
+            OrderedDict()
+        )
+        self._validity_cache_lock = threading.Lock()
+        # Shared client for Replicated API calls, created on first use so the
+        # connection pool is reused across requests
+        self._http_client: Optional[httpx.AsyncClient] = None
 
     async def initialize_bundle(self, source: str, force: bool = False) -> BundleMetadata:
         """
@@ -329,28 +460,12 @@ class BundleManager:
                     # Extract the bundle if it's a tarfile - ensure support bundle extraction succeeds
                     # Support bundles often have complex structures, so we need to handle them properly
                     if str(bundle_path).endswith((".tar.gz", ".tgz")):
-                        import tarfile
-
                         logger.info(f"Extracting bundle to: {extract_dir}")
-                        with tarfile.open(bundle_path, "r:gz") as tar:
-                            # First list the files to get a count
-                            members = tar.getmembers()
-                            logger.info(f"Support bundle contains {len(members)} entries")
-
-                            # Extract all files
-                            from pathlib import PurePath
-
-                            safe_members = []
-                            for member in members:
-                                # Make path safe by removing absolute paths and parent dir traversal
-                                if member.name.startswith(("/", "../")):
-                                    # Remove leading slashes and parent directory traversal
-                                    member.name = PurePath(member.name).name
-                                safe_members.append(member)
-
-                            # Extract with the sanitized member list
-                            # Use filter='data' to only extract file data without modifying metadata
-                            tar.extractall(path=extract_dir, members=safe_members, filter="data")
+                        # Extract in a worker thread so the event loop keeps serving
+                        member_count = await asyncio.to_thread(
+                            _extract_bundle_archive, bundle_path, extract_dir
+                        )
+                        logger.info(f"Support bundle contains {member_count} entries")
 
                         # List extracted files and verify extraction was successful
                         file_count = 0
@@ -390,6 +505,17 @@ class BundleManager:
             logger.exception(f"Unexpected error initializing bundle: {str(e)}")
             raise BundleManagerError(f"Failed to initialize bundle: {str(e)}")
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared HTTP client for Replicated API calls, creating it if needed.
+
+        Returns:
+            The shared httpx client
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(timeout=httpx.Timeout(MAX_DOWNLOAD_TIMEOUT))
+        return self._http_client
+
     async def _get_replicated_signed_url(self, original_url: str) -> str:
         """
         Get the temporary signed download URL from the Replicated Vendor Portal API.
@@ -424,10 +550,9 @@ class BundleManager:
 
         try:
             # === START RESTRUCTURE ===
-            timeout = httpx.Timeout(MAX_DOWNLOAD_TIMEOUT)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                logger.debug(f"Requesting signed URL from Replicated API: {api_url}")
-                response = await client.get(api_url, headers=headers)
+            client = self._get_http_client()
+            logger.debug(f"Requesting signed URL from Replicated API: {api_url}")
+            response = await client.get(api_url, headers=headers)
 
             # Process the response status and content
             if response.status_code == 401:
@@ -532,8 +657,9 @@ class BundleManager:
         actual_download_url = url
         original_url = url  # Keep track of the original URL for logging/ID generation
 
-        # Check if it's a Replicated Vendor Portal URL
-        if REPLICATED_VENDOR_URL_PATTERN.match(url):
+        # Check if it's a Replicated Vendor Portal URL; the match also gives the slug
+        replicated_match = REPLICATED_VENDOR_URL_PATTERN.match(url)
+        if replicated_match:
             try:
                 actual_download_url = await self._get_replicated_signed_url(url)
                 # Log only after successfully getting the signed URL
@@ -557,11 +683,9 @@ class BundleManager:
         filename = ""  # Initialize filename
 
         # Generate filename based on URL type
-        if REPLICATED_VENDOR_URL_PATTERN.match(original_url):
-            match = REPLICATED_VENDOR_URL_PATTERN.match(original_url)
-            slug = match.group(1) if match else "unknown_slug"
+        if replicated_match:
             # Sanitize slug for filename
-            safe_slug = re.sub(r"[^\w\-.]", "_", slug)
+            safe_slug = UNSAFE_FILENAME_CHARS_PATTERN.sub("_", replicated_match.group(1))
             filename = f"replicated_bundle_{safe_slug}.tar.gz"
         else:
             # Use basename for non-Replicated URLs
@@ -570,7 +694,7 @@ class BundleManager:
                 or f"bundle_{self._generate_bundle_id(original_url)}.tar.gz"
             )
             # Ensure filename is safe
-            filename = re.sub(r"[^\w\-.]", "_", filename)
+            filename = UNSAFE_FILENAME_CHARS_PATTERN.sub("_", filename)
             if not filename:  # Handle cases where sanitization results in empty string
                 filename = f"bundle_{self._generate_bundle_id(original_url)}.tar.gz"
 
@@ -619,7 +743,7 @@ class BundleManager:
                     total_size = 0
                     with download_path.open("wb") as f:
                         # Use the 'response' variable from the inner async with
-                        async for chunk in response.content.iter_chunked(8192):
+                        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
                             total_size += len(chunk)
 
                             # Check size limit during download
@@ -1829,41 +1953,93 @@ class BundleManager:
         Returns:
             List of bundle file information
         """
-        logger.info(f"Listing available bundles in {self.bundle_dir}")
+        return [bundle async for bundle in self.iter_available_bundles(include_invalid)]
 
-        bundles: List[BundleFileInfo] = []
+    async def iter_available_bundles(
+        self, include_invalid: bool = False
+    ) -> AsyncIterator[BundleFileInfo]:
+        """
+        Yield available support bundles in the bundle storage directory, newest first.
 
-        # Check if bundle directory exists
-        if not self.bundle_dir.exists():
-            logger.warning(f"Bundle directory {self.bundle_dir} does not exist")
-            return bundles
+        Bundles are validated concurrently, but each one is yielded as soon as it
+        and all newer bundles are checked, so callers that only need the first
+        few bundles do not wait for the whole directory.
 
-        # Find files with bundle extensions
-        bundle_files: List[Path] = []
-        bundle_extensions = [".tar.gz", ".tgz"]
+        Args:
+            include_invalid: Whether to include invalid or inaccessible bundles in the results
 
-        for ext in bundle_extensions:
-            bundle_files.extend(self.bundle_dir.glob(f"*{ext}"))
+        Yields:
+            Bundle file information
+        """
+        logger.info(f"Listing available bundles in {self.bundle_dir}")
+
+        # Find files with bundle extensions, in a single pass over the directory
+        bundle_extensions = (".tar.gz", ".tgz")
+        entries: List[os.DirEntry[str]] = []
+        try:
+            with os.scandir(self.bundle_dir) as it:
+                for entry in it:
+                    try:
+                        if entry.name.endswith(bundle_extensions) and entry.is_file():
+                            entries.append(entry)
+                    except OSError as e:
+                        logger.warning(f"Error processing bundle file {entry.path}: {str(e)}")
+        except FileNotFoundError:
+            logger.warning(f"Bundle directory {self.bundle_dir} does not exist")
+            return
+        except OSError as e:
+            logger.warning(f"Cannot read bundle directory {self.bundle_dir}: {str(e)}")
+            return
 
         logger.info(
-            f"Found {len(bundle_files)} potential bundle files with extensions {bundle_extensions}"
+            f"Found {len(entries)} potential bundle files with extensions {list(bundle_extensions)}"
         )
 
-        # Process each file to get details and check validity
-        for file_path in bundle_files:
+        # Stat each file up front; the stat result feeds both the bundle info and
+        # the validity cache. Files that cannot be stat'ed come last.
+        candidates: List[Tuple[Path, os.stat_result]] = []
+        unreadable: List[BundleFileInfo] = []
+        for entry in entries:
+            file_path = self.bundle_dir / entry.name
             try:
-                # Get basic file information
-                stat_result = file_path.stat()
+                candidates.append((file_path, entry.stat()))
+            except Exception as e:
+                logger.warning(f"Error processing bundle file {file_path}: {str(e)}")
+                if include_invalid:
+                    # Include the file with the error information, without file stats
+                    unreadable.append(
+                        BundleFileInfo(
+                            path=str(file_path),
+                            relative_path=file_path.name,
+                            name=file_path.name,
+                            size_bytes=0,
+                            modified_time=0,
+                            valid=False,
+                            validation_message=f"Error: {str(e)}",
+                        )
+                    )
 
-                # Check if it's a valid bundle by peeking inside
-                valid = False
-                validation_message = None
+        # Sort by modification time (newest first) on the integer stat field,
+        # before any bundle info is built
+        candidates.sort(key=lambda candidate: candidate[1].st_mtime_ns, reverse=True)
+
+        # Check the bundles concurrently in worker threads; peeking inside an
+        # archive blocks on disk reads and decompression
+        checks = [
+            asyncio.ensure_future(
+                asyncio.to_thread(self._check_bundle_validity, file_path, stat_result)
+            )
+            for file_path, stat_result in candidates
+        ]
 
+        try:
+            validation_message: Optional[str]
+            for (file_path, stat_result), check in zip(candidates, checks):
                 try:
-                    valid, validation_message = self._check_bundle_validity(file_path)
+                    valid, validation_message = await check
                 except Exception as e:
                     logger.warning(f"Error checking bundle validity for {file_path}: {str(e)}")
-                    validation_message = f"Error checking validity: {str(e)}"
+                    valid, validation_message = False, f"Error checking validity: {str(e)}"
 
                 # Skip invalid bundles if requested
                 if not valid and not include_invalid:
@@ -1872,107 +2048,120 @@ class BundleManager:
 
                 # Create the bundle info
                 # Store both the full path and the relative path (without bundle_dir prefix)
-                relative_path = file_path.name
-                bundle_info = BundleFileInfo(
+                yield BundleFileInfo(
                     path=str(file_path),
-                    relative_path=relative_path,
+                    relative_path=file_path.name,
                     name=file_path.name,
                     size_bytes=stat_result.st_size,
                     modified_time=stat_result.st_mtime,
                     valid=valid,
                     validation_message=validation_message,
                 )
+        finally:
+            # Drop checks nobody is waiting for when the caller stops early
+            for check in checks:
+                check.cancel()
 
-                bundles.append(bundle_info)
-
-            except Exception as e:
-                logger.warning(f"Error processing bundle file {file_path}: {str(e)}")
-                if include_invalid:
-                    # If including invalid bundles, add it with the error information
-                    try:
-                        bundles.append(
-                            BundleFileInfo(
-                                path=str(file_path),
-                                relative_path=file_path.name,
-                                name=file_path.name,
-                                size_bytes=file_path.stat().st_size if file_path.exists() else 0,
-                                modified_time=(
-                                    file_path.stat().st_mtime if file_path.exists() else 0
-                                ),
-                                valid=False,
-                                validation_message=f"Error: {str(e)}",
-                            )
-                        )
-                    except Exception:
-                        # Last resort to include something if we can't get file stats
-                        bundles.append(
-                            BundleFileInfo(
-                                path=str(file_path),
-                                relative_path=file_path.name,
-                                name=file_path.name,
-                                size_bytes=0,
-                                modified_time=0,
-                                valid=False,
-                                validation_message=f"Error: {str(e)}",
-                            )
-                        )
-
-        # Sort bundles by modification time (newest first)
-        bundles.sort(key=lambda x: x.modified_time, reverse=True)
-
-        return bundles
+        for bundle in unreadable:
+            yield bundle
 
-    def _check_bundle_validity(self, file_path: Path) -> Tuple[bool, Optional[str]]:
+    def _check_bundle_validity(
+        self, file_path: Path, stat_result: Optional[os.stat_result] = None
+    ) -> Tuple[bool, Optional[str]]:
         """
         Check if a file appears to be a valid support bundle.
 
+        Results are cached per path, modification time and size, so listing the
+        same bundles again only costs a stat call per file.
+
         Args:
             file_path: Path to the potential bundle file
+            stat_result: The result of stat() on the file, if the caller already has it
 
         Returns:
             Tuple of (is_valid, validation_message)
         """
-        if not file_path.exists():
-            return False, "File not found"
+        if stat_result is None:
+            try:
+                stat_result = file_path.stat()
+            except OSError:
+                return False, "File not found"
 
-        if not file_path.is_file():
+        if not stat.S_ISREG(stat_result.st_mode):
             return False, "Not a file"
 
         # Check file extension
         if not str(file_path).lower().endswith((".tar.gz", ".tgz")):
             return False, "Not a .tar.gz or .tgz file"
 
-        # Peek inside the tarfile to verify it's a support bundle
+        if stat_result.st_size < MIN_BUNDLE_SIZE:
+            return False, "File too small to be a bundle"
+
+        key = (str(file_path), stat_result.st_mtime_ns, stat_result.st_size)
+        with self._validity_cache_lock:
+            cached = self._validity_cache.get(key)
+            if cached is not None:
+                self._validity_cache.move_to_end(key)
+                return cached
+
         try:
-            with tarfile.open(file_path, "r:gz") as tar:
-                # List first few entries to check structure without extracting
-                members = tar.getmembers()[:20]  # Just check the first 20 entries for efficiency
+            result = self._probe_bundle_archive(file_path)
+        except Exception as e:
+            # Not cached: the error may not be tied to the file contents
+            return False, f"Error checking file: {str(e)}"
 
-                # Look for patterns that indicate a support bundle
-                has_cluster_resources = False
-                has_support_bundle_dir = False
+        with self._validity_cache_lock:
+            self._validity_cache[key] = result
+            if len(self._validity_cache) > BUNDLE_VALIDITY_CACHE_SIZE:
+                self._validity_cache.popitem(last=False)
+        return result
 
-                for member in members:
-                    # Check for common support bundle directory structure
-                    if "cluster-resources/" in member.name:
-                        has_cluster_resources = True
+    def _probe_bundle_archive(self, file_path: Path) -> Tuple[bool, Optional[str]]:
+        """
+        Look inside a bundle archive for the support bundle directory structure.
 
-                    # Check for a top-level support-bundle directory
-                    if member.name.startswith("support-bundle-"):
-                        has_support_bundle_dir = True
+        Args:
+            file_path: Path to the .tar.gz or .tgz file
 
-                if has_cluster_resources or has_support_bundle_dir:
-                    return True, None
+        Returns:
+            Tuple of (is_valid, validation_message)
 
-                return (
-                    False,
-                    "File doesn't contain expected support bundle structure (no cluster-resources or support-bundle directories)",
-                )
+        Raises:
+            OSError: If the file cannot be read
+        """
+        # Peek inside the archive to verify it's a support bundle. Only the first
+        # few member headers are needed, so they are read straight from the
+        # decompressed stream; tarfile is used only for headers the probe does
+        # not handle.
+        try:
+            with open(file_path, "rb") as f:
+                if f.read(len(GZIP_MAGIC)) != GZIP_MAGIC:
+                    return False, "Not a valid tar.gz file: missing gzip header"
+                f.seek(0)
+                with gzip.GzipFile(fileobj=f) as gz:
+                    names = _read_tar_member_names(gz, BUNDLE_PROBE_MEMBERS)
+
+            if names is not None:
+                found = any(_is_support_bundle_member(name) for name in names)
+            else:
+                # Stream mode reads members one at a time, without indexing the
+                # rest of the archive, and stops at the first matching member
+                with tarfile.open(file_path, mode="r|gz") as tar:
+                    found = any(
+                        _is_support_bundle_member(member.name)
+                        for member in itertools.islice(tar, BUNDLE_PROBE_MEMBERS)
+                    )
+
+            if found:
+                return True, None
+
+            return (
+                False,
+                "File doesn't contain expected support bundle structure (no cluster-resources or support-bundle directories)",
+            )
 
-        except tarfile.ReadError as e:
+        except (tarfile.ReadError, gzip.BadGzipFile, EOFError, zlib.error) as e:
             return False, f"Not a valid tar.gz file: {str(e)}"
-        except Exception as e:
-            return False, f"Error checking file: {str(e)}"
 
     async def cleanup(self) -> None:
         """
@@ -1982,6 +2171,7 @@ class BundleManager:
         1. Terminates the active bundle and its processes
         2. Removes extracted bundle directories
         3. Removes the temporary bundle directory if created by this instance
+        4. Closes the shared HTTP client
 
         This should be called when shutting down the server to ensure proper resource
         management and prevent orphaned files/processes.
@@ -2035,4 +2225,12 @@ class BundleManager:
             except Exception as e:
                 logger.error(f"Failed to remove temporary bundle directory: {str(e)}")
 
+        # 4. Close the shared HTTP client; it is recreated if needed again
+        if self._http_client is not None:
+            try:
+                await self._http_client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client: {str(e)}")
+            self._http_client = None
+
         logger.info("Cleanup completed")
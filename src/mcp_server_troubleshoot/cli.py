@@ -12,7 +12,7 @@ import os
 
 from .server import mcp, shutdown
 from .config import get_recommended_client_config
-from .lifecycle import setup_signal_handlers
+from .lifecycle import setup_event_loop_policy, setup_signal_handlers
 
 logger = logging.getLogger(__name__)
 
@@ -172,6 +172,7 @@ def main() -> None:
     # Run the FastMCP server - this handles stdin/stdout automatically
     try:
         logger.debug("Starting FastMCP server")
+        setup_event_loop_policy()
         mcp.run()
     except KeyboardInterrupt:
         logger.info("Server interrupted, shutting down")
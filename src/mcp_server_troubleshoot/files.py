@@ -12,7 +12,7 @@ import re
 from pathlib import Path
 from typing import List, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .bundle import BundleManager
 
@@ -54,6 +54,8 @@ class ListFilesArgs(BaseModel):
     Arguments for listing files and directories.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     path: str = Field(description="The path within the bundle to list")
     recursive: bool = Field(False, description="Whether to list recursively")
     verbosity: Optional[str] = Field(
@@ -99,6 +101,8 @@ class ReadFileArgs(BaseModel):
     Arguments for reading a file.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     path: str = Field(description="The path to the file within the bundle")
     start_line: int = Field(0, description="The line number to start reading from (0-indexed)")
     end_line: Optional[int] = Field(
@@ -150,6 +154,8 @@ class GrepFilesArgs(BaseModel):
     Arguments for searching files for a pattern.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     pattern: str = Field(description="The pattern to search for")
     path: str = Field(description="The path within the bundle to search")
     recursive: bool = Field(True, description="Whether to search recursively")
@@ -6,6 +6,7 @@ verbosity levels to optimize token usage while maintaining full functionality
 for debugging purposes.
 """
 
+import functools
 import json
 import os
 from enum import Enum
@@ -15,6 +16,52 @@ from .bundle import BundleFileInfo, BundleMetadata
 from .files import FileListResult, FileContentResult, GrepResult, GrepMatch
 from .kubectl import KubectlResult
 
+# Responses such as kubectl output and file listings can be large, so serialize
+# them with orjson when it is installed
+try:
+    from orjson import OPT_INDENT_2 as _ORJSON_INDENT_2
+    from orjson import dumps as _orjson_dumps
+except ImportError:  # pragma: no cover
+    _orjson_dumps = None  # type: ignore[assignment]
+
+
+def _dumps_compact(data: Any) -> str:
+    """
+    Serialize data as compact JSON.
+
+    Args:
+        data: The JSON-compatible data to serialize
+
+    Returns:
+        The JSON string without insignificant whitespace
+    """
+    if _orjson_dumps is not None:
+        try:
+            return _orjson_dumps(data).decode("utf-8")
+        except TypeError:
+            # orjson rejects some values json accepts, e.g. integers over 64 bits
+            pass
+    # Keep non-ASCII text raw, as orjson writes it, so output does not depend on it
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def _dumps_indented(data: Any) -> str:
+    """
+    Serialize data as JSON indented by two spaces.
+
+    Args:
+        data: The JSON-compatible data to serialize
+
+    Returns:
+        The indented JSON string
+    """
+    if _orjson_dumps is not None:
+        try:
+            return _orjson_dumps(data, option=_ORJSON_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
 
 class VerbosityLevel(str, Enum):
     """Verbosity levels for response formatting."""
@@ -25,6 +72,60 @@ class VerbosityLevel(str, Enum):
     DEBUG = "debug"
 
 
+_VERBOSITY_LEVELS = {level.value: level for level in VerbosityLevel}
+
+
+def _verbosity_from_environment() -> str:
+    """
+    Resolve the default verbosity from MCP_VERBOSITY and MCP_DEBUG.
+
+    Returns:
+        The verbosity level name, "debug" when MCP_DEBUG is set
+    """
+    if os.environ.get("MCP_DEBUG", "").lower() in ("true", "1", "yes"):
+        return "debug"
+    return os.environ.get("MCP_VERBOSITY", "minimal")
+
+
+# Verbosity used when none is requested, read from the environment once at import
+_DEFAULT_VERBOSITY = _verbosity_from_environment()
+
+
+def set_default_verbosity(verbosity: Optional[str] = None) -> None:
+    """
+    Set the verbosity used by formatters created without an explicit level.
+
+    Args:
+        verbosity: The verbosity level, or None to re-read the environment
+    """
+    global _DEFAULT_VERBOSITY
+    _DEFAULT_VERBOSITY = verbosity if verbosity is not None else _verbosity_from_environment()
+
+
+# Human-readable size units, largest first
+_FILE_SIZE_UNITS = ((1 << 30, "GB"), (1 << 20, "MB"), (1 << 10, "KB"))
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_file_size(size_bytes: int) -> str:
+    """
+    Format a file size in human-readable form.
+
+    Bundle listings repeat many sizes (empty and block-aligned files), so the
+    results are cached.
+
+    Args:
+        size_bytes: The size in bytes
+
+    Returns:
+        The size in B, KB, MB or GB
+    """
+    for threshold, unit in _FILE_SIZE_UNITS:
+        if size_bytes >= threshold:
+            return f"{size_bytes / threshold:.1f} {unit}"
+    return f"{size_bytes} B"
+
+
 class ResponseFormatter:
     """
     Formats MCP tool responses based on verbosity level.
@@ -42,18 +143,13 @@ class ResponseFormatter:
 
         Args:
             verbosity: The verbosity level (minimal|standard|verbose|debug).
-                      If None, uses environment variable MCP_VERBOSITY or defaults to minimal.
+                      If None, uses the default level, which comes from MCP_VERBOSITY or
+                      MCP_DEBUG at import time and can be changed with set_default_verbosity.
         """
         if verbosity is None:
-            # Check environment variables
-            verbosity = os.environ.get("MCP_VERBOSITY", "minimal")
-            if os.environ.get("MCP_DEBUG", "").lower() in ("true", "1", "yes"):
-                verbosity = "debug"
+            verbosity = _DEFAULT_VERBOSITY
 
-        try:
-            self.verbosity = VerbosityLevel(verbosity.lower())
-        except ValueError:
-            self.verbosity = VerbosityLevel.MINIMAL
+        self.verbosity = _VERBOSITY_LEVELS.get(verbosity.lower(), VerbosityLevel.MINIMAL)
 
     def format_bundle_initialization(
         self,
@@ -65,9 +161,9 @@ class ResponseFormatter:
 
         if self.verbosity == VerbosityLevel.MINIMAL:
             if api_server_available:
-                return json.dumps({"bundle_id": metadata.id, "status": "ready"})
+                return _dumps_compact({"bundle_id": metadata.id, "status": "ready"})
             else:
-                return json.dumps({"bundle_id": metadata.id, "status": "api_unavailable"})
+                return _dumps_compact({"bundle_id": metadata.id, "status": "api_unavailable"})
 
         elif self.verbosity == VerbosityLevel.STANDARD:
             result = {
@@ -76,7 +172,7 @@ class ResponseFormatter:
                 "status": "ready" if api_server_available else "api_unavailable",
                 "initialized": metadata.initialized,
             }
-            return json.dumps(result)
+            return _dumps_compact(result)
 
         else:  # VERBOSE or DEBUG
             # Convert metadata to dict
@@ -85,15 +181,17 @@ class ResponseFormatter:
             metadata_dict["kubeconfig_path"] = str(metadata_dict["kubeconfig_path"])
 
             if api_server_available:
-                response = f"Bundle initialized successfully:\n```json\n{json.dumps(metadata_dict, indent=2)}\n```"
+                response = f"Bundle initialized successfully:\n```json\n{_dumps_indented(metadata_dict)}\n```"
             else:
                 response = (
                     f"Bundle initialized but API server is NOT available. kubectl commands may fail:\n"
-                    f"```json\n{json.dumps(metadata_dict, indent=2)}\n```"
+                    f"```json\n{_dumps_indented(metadata_dict)}\n```"
                 )
 
                 if diagnostics and self.verbosity == VerbosityLevel.DEBUG:
-                    response += f"\n\nDiagnostic information:\n```json\n{json.dumps(diagnostics, indent=2)}\n```"
+                    response += (
+                        f"\n\nDiagnostic information:\n```json\n{_dumps_indented(diagnostics)}\n```"
+                    )
 
             return response
 
@@ -102,25 +200,24 @@ class ResponseFormatter:
 
         if not bundles:
             if self.verbosity == VerbosityLevel.MINIMAL:
-                return json.dumps([])
+                return _dumps_compact([])
             else:
                 return "No support bundles found. You may need to download or transfer a bundle to the bundle storage directory."
 
         if self.verbosity == VerbosityLevel.MINIMAL:
-            return json.dumps([bundle.name for bundle in bundles if bundle.valid])
+            return _dumps_compact([bundle.name for bundle in bundles if bundle.valid])
 
         elif self.verbosity == VerbosityLevel.STANDARD:
-            bundle_list = []
-            for bundle in bundles:
-                if bundle.valid:  # Only include valid bundles in standard mode
-                    bundle_list.append(
-                        {
-                            "name": bundle.name,
-                            "source": bundle.relative_path,
-                            "size_bytes": bundle.size_bytes,
-                        }
-                    )
-            return json.dumps({"bundles": bundle_list, "count": len(bundle_list)})
+            bundle_list = [
+                {
+                    "name": bundle.name,
+                    "source": bundle.relative_path,
+                    "size_bytes": bundle.size_bytes,
+                }
+                for bundle in bundles
+                if bundle.valid  # Only include valid bundles in standard mode
+            ]
+            return _dumps_compact({"bundles": bundle_list, "count": len(bundle_list)})
 
         else:  # VERBOSE or DEBUG
             # Full format with usage instructions (current behavior)
@@ -153,7 +250,7 @@ class ResponseFormatter:
                 bundle_list.append(bundle_entry)
 
             response_obj = {"bundles": bundle_list, "total": len(bundle_list)}
-            response = f"```json\n{json.dumps(response_obj, indent=2)}\n```\n\n"
+            response = f"```json\n{_dumps_indented(response_obj)}\n```\n\n"
 
             # Add usage instructions
             example_bundle = next((b for b in bundles if b.valid), bundles[0] if bundles else None)
@@ -171,21 +268,20 @@ class ResponseFormatter:
         """Format file list response."""
 
         if self.verbosity == VerbosityLevel.MINIMAL:
-            return json.dumps(
+            return _dumps_compact(
                 [entry.name + ("/" if entry.type == "dir" else "") for entry in result.entries]
             )
 
         elif self.verbosity == VerbosityLevel.STANDARD:
-            files = []
-            for entry in result.entries:
-                files.append(
-                    {
-                        "name": entry.name,
-                        "type": entry.type,
-                        "size": entry.size if entry.type == "file" else None,
-                    }
-                )
-            return json.dumps({"files": files, "count": len(files)})
+            files = [
+                {
+                    "name": entry.name,
+                    "type": entry.type,
+                    "size": entry.size if entry.type == "file" else None,
+                }
+                for entry in result.entries
+            ]
+            return _dumps_compact({"files": files, "count": len(files)})
 
         else:  # VERBOSE or DEBUG
             # Current full format
@@ -196,7 +292,7 @@ class ResponseFormatter:
             )
 
             entries_data = [entry.model_dump() for entry in result.entries]
-            entries_json = json.dumps(entries_data, indent=2)
+            entries_json = _dumps_indented(entries_data)
             response += f"```json\n{entries_json}\n```\n"
 
             metadata = {
@@ -205,7 +301,7 @@ class ResponseFormatter:
                 "total_files": result.total_files,
                 "total_dirs": result.total_dirs,
             }
-            metadata_str = json.dumps(metadata, indent=2)
+            metadata_str = _dumps_indented(metadata)
             response += f"Directory metadata:\n```json\n{metadata_str}\n```"
 
             return response
@@ -245,51 +341,41 @@ class ResponseFormatter:
         """Format grep search results."""
 
         if self.verbosity == VerbosityLevel.MINIMAL:
-            # Ultra-compact format with no whitespace
-            matches = []
-            files_with_matches: Dict[str, List[GrepMatch]] = {}
-
-            # Group matches by file and track per-file counts
+            # Ultra-compact format with no whitespace. Build the compact match
+            # objects while grouping them by file, keeping full line content
+            # instead of just the match (lines are 1-indexed for display)
+            files_with_matches: Dict[str, List[Dict[str, Any]]] = {}
             for match in result.matches:
-                if match.path not in files_with_matches:
-                    files_with_matches[match.path] = []
-                files_with_matches[match.path].append(match)
-
-            # Build compact match objects with full line content
-            for file_path, file_matches in files_with_matches.items():
-                for i, match in enumerate(file_matches):
-                    match_obj = {
-                        "file": match.path,
-                        "line": match.line_number + 1,  # 1-indexed for display
-                        "content": match.line,  # Full line content instead of just match
-                    }
-                    # Add truncated indicator if this is the last match for this file
-                    # and we might have hit the per-file limit
-                    if (
-                        i == len(file_matches) - 1 and len(file_matches) >= 5
-                    ):  # Default max_results_per_file
-                        match_obj["truncated"] = True
-                    matches.append(match_obj)
+                files_with_matches.setdefault(match.path, []).append(
+                    {"file": match.path, "line": match.line_number + 1, "content": match.line}
+                )
+
+            matches: List[Dict[str, Any]] = []
+            for file_match_objs in files_with_matches.values():
+                # Mark the last match of a file that may have hit the per-file
+                # limit (default max_results_per_file)
+                if len(file_match_objs) >= 5:
+                    file_match_objs[-1]["truncated"] = True
+                matches.extend(file_match_objs)
 
             # Create final result with truncation indicators
             compact_result: Dict[str, Any] = {"matches": matches}
             if hasattr(result, "files_truncated") and result.files_truncated:
                 compact_result["files_truncated"] = True
 
-            return json.dumps(compact_result, separators=(",", ":"))
+            return _dumps_compact(compact_result)
 
         elif self.verbosity == VerbosityLevel.STANDARD:
-            matches = []
-            for match in result.matches:
-                matches.append(
-                    {
-                        "file": match.path,
-                        "line": match.line_number + 1,
-                        "content": match.line,
-                        "match": match.match,
-                    }
-                )
-            return json.dumps(
+            matches = [
+                {
+                    "file": match.path,
+                    "line": match.line_number + 1,
+                    "content": match.line,
+                    "match": match.match,
+                }
+                for match in result.matches
+            ]
+            return _dumps_compact(
                 {
                     "matches": matches,
                     "total": result.total_matches,
@@ -335,7 +421,7 @@ class ResponseFormatter:
                 "case_sensitive": result.case_sensitive,
                 "truncated": result.truncated,
             }
-            metadata_str = json.dumps(metadata, indent=2)
+            metadata_str = _dumps_indented(metadata)
             response += f"Search metadata:\n```json\n{metadata_str}\n```"
 
             return response
@@ -345,20 +431,20 @@ class ResponseFormatter:
 
         if self.verbosity == VerbosityLevel.MINIMAL:
             if result.is_json:
-                return json.dumps(result.output)
+                return _dumps_compact(result.output)
             else:
                 return result.stdout
 
         elif self.verbosity == VerbosityLevel.STANDARD:
             if result.is_json:
-                return json.dumps({"output": result.output, "exit_code": result.exit_code})
+                return _dumps_compact({"output": result.output, "exit_code": result.exit_code})
             else:
-                return json.dumps({"output": result.stdout, "exit_code": result.exit_code})
+                return _dumps_compact({"output": result.stdout, "exit_code": result.exit_code})
 
         else:  # VERBOSE or DEBUG
             # Current full format
             if result.is_json:
-                output_str = json.dumps(result.output)
+                output_str = _dumps_compact(result.output)
                 response = f"kubectl command executed successfully:\n```json\n{output_str}\n```"
             else:
                 output_str = result.stdout
@@ -373,7 +459,7 @@ class ResponseFormatter:
             if self.verbosity == VerbosityLevel.DEBUG and result.stderr:
                 metadata["stderr"] = result.stderr
 
-            metadata_str = json.dumps(metadata, indent=2)
+            metadata_str = _dumps_indented(metadata)
             response += f"\nCommand metadata:\n```json\n{metadata_str}\n```"
 
             return response
@@ -391,29 +477,43 @@ class ResponseFormatter:
         else:  # VERBOSE or DEBUG
             response = error_message
             if diagnostics and self.verbosity == VerbosityLevel.DEBUG:
-                response += f"\n\nDiagnostic information:\n```json\n{json.dumps(diagnostics, indent=2)}\n```"
+                response += (
+                    f"\n\nDiagnostic information:\n```json\n{_dumps_indented(diagnostics)}\n```"
+                )
             return response
 
     def _format_file_size(self, size_bytes: int) -> str:
         """Format file size in human-readable format."""
-        if size_bytes < 1024:
-            return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        return _format_file_size(size_bytes)
 
 
 def get_formatter(verbosity: Optional[str] = None) -> ResponseFormatter:
     """
     Get a ResponseFormatter instance with the specified verbosity level.
 
+    Formatters hold no state besides their level, so one instance is shared per
+    explicit level. Without a level, the current default level is used.
+
     Args:
-        verbosity: The verbosity level, or None to use environment defaults
+        verbosity: The verbosity level, or None to use the default level
 
     Returns:
         A configured ResponseFormatter instance
     """
+    if verbosity is None:
+        return ResponseFormatter()
+    return _get_cached_formatter(verbosity.lower())
+
+
+@functools.lru_cache(maxsize=8)
+def _get_cached_formatter(verbosity: str) -> ResponseFormatter:
+    """
+    Get the shared ResponseFormatter for a lowercased verbosity level.
+
+    Args:
+        verbosity: The lowercased verbosity level
+
+    Returns:
+        The ResponseFormatter for that level
+    """
     return ResponseFormatter(verbosity)
@@ -11,14 +11,120 @@ import json
 import logging
 import os
 import re
+import shutil
+import time
+from functools import lru_cache
 from typing import Any, Optional, Tuple
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from .bundle import BundleManager, BundleMetadata
 
+# orjson parses large kubectl JSON dumps considerably faster; fall back to the
+# standard library when it is not installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as _json_loads
+
 logger = logging.getLogger(__name__)
 
+# kubectl subcommands that can modify the cluster or open interactive sessions
+_DANGEROUS_OPERATIONS = frozenset(
+    {
+        "delete",
+        "edit",
+        "exec",
+        "cp",
+        "patch",
+        "port-forward",
+        "attach",
+        "replace",
+        "apply",
+    }
+)
+_DANGEROUS_RE = re.compile(
+    r"^\s*(" + "|".join(map(re.escape, sorted(_DANGEROUS_OPERATIONS))) + r")\b"
+)
+
+# Explicit "-o <format>" in a command, and the formats that are never JSON
+_OUTPUT_FORMAT_RE = re.compile(r"\s+-o\s+(\S+)")
+_NON_JSON_FORMATS = frozenset({"yaml", "wide", "name"})
+
+# Chunk size used when draining kubectl output
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=256)
+def _tokenize(command: str) -> Tuple[str, ...]:
+    """
+    Split a kubectl command into its arguments.
+
+    Agents tend to repeat the same handful of commands, so the result is cached.
+
+    Args:
+        command: The kubectl command, without the leading "kubectl"
+
+    Returns:
+        The command arguments
+    """
+    return tuple(command.split())
+
+
+@lru_cache(maxsize=8)
+def _kubectl_bin(search_path: Optional[str]) -> str:
+    """
+    Resolve the kubectl executable on the given search path.
+
+    Resolving once spares every spawn its own PATH walk. The cache is keyed on
+    the search path so a changed PATH is still honored.
+
+    Args:
+        search_path: The PATH value kubectl is looked up in
+
+    Returns:
+        The absolute path of kubectl, or "kubectl" if it cannot be found
+    """
+    return shutil.which("kubectl", path=search_path) or "kubectl"
+
+
+async def _read_stream(stream: asyncio.StreamReader) -> bytearray:
+    """
+    Read a stream to EOF in fixed-size chunks.
+
+    Args:
+        stream: The stream to drain
+
+    Returns:
+        Everything read from the stream
+    """
+    data = bytearray()
+    while chunk := await stream.read(_READ_CHUNK_SIZE):
+        data.extend(chunk)
+    return data
+
+
+async def _read_all(process: asyncio.subprocess.Process) -> Tuple[bytes, bytes]:
+    """
+    Collect the output of a process and wait for it to exit.
+
+    stdout and stderr are drained concurrently into growing buffers, so large
+    outputs are not held twice the way communicate() joins its read chunks.
+
+    Args:
+        process: The process to read from
+
+    Returns:
+        A tuple of (stdout, stderr)
+    """
+    # Spawned with stdout and stderr set to PIPE, so both streams exist
+    assert process.stdout is not None and process.stderr is not None
+    stdout, stderr = await asyncio.gather(
+        _read_stream(process.stdout), _read_stream(process.stderr)
+    )
+    await process.wait()
+    return stdout, stderr
+
 
 class KubectlError(Exception):
     """Exception raised when a kubectl command fails."""
@@ -68,20 +174,11 @@ class KubectlCommandArgs(BaseModel):
             raise ValueError("kubectl command cannot be empty")
 
         # Check for potentially dangerous operations
-        dangerous_operations = [
-            "delete",
-            "edit",
-            "exec",
-            "cp",
-            "patch",
-            "port-forward",
-            "attach",
-            "replace",
-            "apply",
-        ]
-        for op in dangerous_operations:
-            if re.search(rf"^\s*{op}\b", v):
-                raise ValueError(f"Kubectl command '{op}' is not allowed for safety reasons")
+        match = _DANGEROUS_RE.match(v)
+        if match:
+            raise ValueError(
+                f"Kubectl command '{match.group(1)}' is not allowed for safety reasons"
+            )
 
         return v
 
@@ -91,6 +188,8 @@ class KubectlResult(BaseModel):
     Result of a kubectl command execution.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     command: str = Field(description="The kubectl command that was executed")
     exit_code: int | None = Field(description="The exit code of the command")
     stdout: str = Field(description="The standard output of the command")
@@ -122,6 +221,8 @@ class KubectlExecutor:
             bundle_manager: The bundle manager that provides the kubeconfig
         """
         self.bundle_manager = bundle_manager
+        # Monotonic nanosecond clock used to time commands, replaceable in tests
+        self._clock = time.perf_counter_ns
 
     async def execute(
         self, command: str, timeout: int = 30, json_output: bool = True
@@ -184,13 +285,17 @@ class KubectlExecutor:
 
         # Normal execution for non-test mode
         # Format the command
-        if json_output and not re.search(r"\s+-o\s+(\S+)", command):
+        format_match = _OUTPUT_FORMAT_RE.search(command)
+        if json_output and not format_match:
             command = f"{command} -o json"
 
+        # Formats that never produce JSON are not worth a parse attempt
+        try_json = json_output and not (format_match and format_match.group(1) in _NON_JSON_FORMATS)
+
         kubeconfig_path = bundle.kubeconfig_path
 
         # Start timer
-        start_time = asyncio.get_event_loop().time()
+        start_ns = self._clock()
 
         try:
             # Create environment with KUBECONFIG set
@@ -200,7 +305,7 @@ class KubectlExecutor:
             logger.info(f"Executing kubectl command: {command}")
 
             # Split the command into parts for security
-            cmd = ["kubectl"] + command.split()
+            cmd = (_kubectl_bin(env.get("PATH")), *_tokenize(command))
 
             # Run the command
             process = await asyncio.create_subprocess_exec(
@@ -209,7 +314,7 @@ class KubectlExecutor:
 
             # Wait for the command to complete with timeout
             try:
-                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+                stdout, stderr = await asyncio.wait_for(_read_all(process), timeout=timeout)
             except asyncio.TimeoutError:
                 # Kill the process if it times out
                 try:
@@ -223,22 +328,23 @@ class KubectlExecutor:
                 )
 
             # End timer
-            end_time = asyncio.get_event_loop().time()
-            duration_ms = int((end_time - start_time) * 1000)
+            duration_ms = (self._clock() - start_ns) // 1_000_000
 
             # Convert bytes to string
             stdout_str = stdout.decode("utf-8")
             stderr_str = stderr.decode("utf-8")
 
-            # Process the output
-            output, is_json = self._process_output(
-                stdout_str, process.returncode == 0 and json_output
-            )
+            # Parse JSON straight from the raw bytes so the parser does not have
+            # to re-encode the decoded string
+            output, is_json = self._process_output(stdout, process.returncode == 0 and try_json)
+            if not is_json:
+                output = stdout_str
 
-            # Create the result
-            result = KubectlResult(
+            # Create the result; every value here is produced by this method, so
+            # field validation is skipped (mirroring validate_exit_code inline)
+            result = KubectlResult.model_construct(
                 command=command,
-                exit_code=process.returncode,
+                exit_code=1 if process.returncode is None else process.returncode,
                 stdout=stdout_str,
                 stderr=stderr_str,
                 output=output,
@@ -261,12 +367,13 @@ class KubectlExecutor:
             logger.exception(f"Error executing kubectl command: {str(e)}")
             raise KubectlError("Failed to execute kubectl command", 1, f"Error: {str(e)}")
 
-    def _process_output(self, output: str, try_json: bool) -> Tuple[Any, bool]:
+    @staticmethod
+    def _process_output(output: str | bytes, try_json: bool) -> Tuple[Any, bool]:
         """
         Process the command output.
 
         Args:
-            output: The command output
+            output: The command output, either decoded or as raw bytes
             try_json: Whether to try parsing the output as JSON
 
         Returns:
@@ -276,7 +383,7 @@ class KubectlExecutor:
             return output, False
 
         try:
-            parsed = json.loads(output)
+            parsed = _json_loads(output)
             return parsed, True
         except (json.JSONDecodeError, ValueError):
             return output, False
@@ -9,16 +9,14 @@ This is especially important for stdio mode operation with FastMCP.
 import asyncio
 import logging
 import os
-import shutil
 import signal
 import sys
 import tempfile
 import time
-import uuid
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, AsyncIterator, Dict
+from typing import Any, AsyncIterator, Dict, Optional
 
 from mcp.server.fastmcp import FastMCP
 
@@ -41,22 +39,38 @@ class AppContext:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-def create_temp_directory() -> str:
-    """Create a temporary directory for bundle extraction."""
-    temp_dir = os.path.join(tempfile.gettempdir(), f"mcp-troubleshoot-{uuid.uuid4()}")
-    os.makedirs(temp_dir, exist_ok=True)
-    logger.info(f"Created temporary directory: {temp_dir}")
+def create_temp_directory() -> tempfile.TemporaryDirectory[str]:
+    """Create a temporary directory for bundle extraction, removed by its cleanup()."""
+    temp_dir = tempfile.TemporaryDirectory(prefix="mcp-troubleshoot-")
+    logger.info(f"Created temporary directory: {temp_dir.name}")
     return temp_dir
 
 
-async def periodic_bundle_cleanup(bundle_manager: BundleManager, interval: int = 3600) -> None:
-    """Periodically clean up old bundles."""
+async def periodic_bundle_cleanup(
+    bundle_manager: BundleManager,
+    interval: float = 3600,
+    stop_event: Optional[asyncio.Event] = None,
+) -> None:
+    """
+    Periodically clean up old bundles.
+
+    Args:
+        bundle_manager: The bundle manager to clean up
+        interval: Seconds between cleanups
+        stop_event: Event that ends the task as soon as it is set, instead of
+            after the current wait
+    """
     logger.info(f"Starting periodic bundle cleanup (interval: {interval}s)")
+    if stop_event is None:
+        stop_event = asyncio.Event()
     try:
-        while True:
-            await asyncio.sleep(interval)
-            logger.info("Running bundle cleanup")
-            await bundle_manager.cleanup()
+        while not stop_event.is_set():
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                logger.info("Running bundle cleanup")
+                await bundle_manager.cleanup()
+        logger.info("Bundle cleanup task stopped")
     except asyncio.CancelledError:
         logger.info("Bundle cleanup task cancelled")
         raise
@@ -104,14 +118,15 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     # Initialize file explorer
     file_explorer = FileExplorer(bundle_manager)
 
-    # Track background tasks
+    # Track background tasks, which stop once stop_event is set
     background_tasks = {}
+    stop_event = asyncio.Event()
 
     # Start periodic cleanup task if configured
     if enable_periodic_cleanup:
         logger.info(f"Enabling periodic bundle cleanup every {cleanup_interval} seconds")
         background_tasks["bundle_cleanup"] = asyncio.create_task(
-            periodic_bundle_cleanup(bundle_manager, cleanup_interval)
+            periodic_bundle_cleanup(bundle_manager, cleanup_interval, stop_event)
         )
 
     # Create context to share with tools
@@ -119,7 +134,7 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
         bundle_manager=bundle_manager,
         file_explorer=file_explorer,
         kubectl_executor=kubectl_executor,
-        temp_dir=temp_dir,
+        temp_dir=temp_dir.name,
         background_tasks=background_tasks,
         metadata={
             "start_time": start_time,
@@ -142,15 +157,26 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
             f"Shutting down MCP Troubleshoot Server after running for {elapsed:.2f} seconds"
         )
 
-        # Cancel background tasks with timeout
-        for name, task in background_tasks.items():
-            if not task.done():
-                logger.info(f"Cancelling background task: {name}")
-                task.cancel()
-                try:
-                    await asyncio.wait_for(asyncio.shield(task), timeout=5.0)
-                except (asyncio.CancelledError, asyncio.TimeoutError):
-                    logger.warning(f"Task {name} did not complete gracefully within timeout")
+        # Ask background tasks to stop, give them time to finish, and cancel
+        # only the ones still running after the timeout
+        stop_event.set()
+        shutdown_cancelled = False
+        try:
+            if background_tasks:
+                _, pending = await asyncio.wait(background_tasks.values(), timeout=5.0)
+                if pending:
+                    logger.warning("Background tasks did not complete gracefully within timeout")
+                    for name, task in background_tasks.items():
+                        if task in pending:
+                            logger.info(f"Cancelling background task: {name}")
+                            task.cancel()
+                    await asyncio.wait(pending)
+            for name, task in background_tasks.items():
+                if not task.cancelled() and task.exception() is not None:
+                    logger.error(f"Background task {name} failed: {task.exception()}")
+        except asyncio.CancelledError:
+            # The shutdown itself was cancelled; finish the cleanup, then re-raise
+            shutdown_cancelled = True
 
         # Clean up bundle manager resources
         try:
@@ -160,15 +186,17 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
             logger.error(f"Error during bundle manager cleanup: {e}")
 
         # Clean up temporary files
-        if os.path.exists(temp_dir):
-            logger.info(f"Removing temporary directory: {temp_dir}")
-            try:
-                shutil.rmtree(temp_dir)
-            except OSError as e:
-                logger.error(f"Failed to remove temp directory {temp_dir}: {e}")
+        logger.info(f"Removing temporary directory: {temp_dir.name}")
+        try:
+            temp_dir.cleanup()
+        except OSError as e:
+            logger.error(f"Failed to remove temp directory {temp_dir.name}: {e}")
 
         logger.info("Shutdown complete")
 
+        if shutdown_cancelled:
+            raise asyncio.CancelledError()
+
 
 def handle_signal(signum: int, frame: Any) -> None:
     """
@@ -251,3 +279,25 @@ def setup_signal_handlers() -> None:
                 logger.warning(f"Failed to register signal handler for {sig_name}: {e}")
     except Exception as e:
         logger.warning(f"Error setting up signal handlers: {e}")
+
+
+def setup_event_loop_policy() -> None:
+    """
+    Run the server on uvloop when it is installed.
+
+    uvloop speeds up the subprocess spawning and pipe I/O that every kubectl
+    and sbctl call goes through. Without it the default asyncio loop is used.
+    """
+    # Leave the event loop policy alone during test runs, as for signal handlers
+    if "PYTEST_CURRENT_TEST" in os.environ:
+        logger.debug("Running in pytest, keeping the default event loop policy")
+        return
+
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop not installed, using the default asyncio event loop")
+        return
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("Using uvloop event loop")
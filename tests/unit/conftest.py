@@ -8,7 +8,7 @@ import pytest
 import pytest_asyncio
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 import asyncio
 
 # Helper functions for async tests are defined in the main conftest.py
@@ -40,7 +40,7 @@ class TestAssertions:
 
     @staticmethod
     def assert_api_response_valid(
-        response: List[Any], expected_type: str = "text", contains: Optional[List[str]] = None
+        response: List[Any], expected_type: str = "text", contains: Optional[Sequence[str]] = None
     ) -> None:
         """
         Assert that an MCP API response is valid and contains expected content.
@@ -48,7 +48,7 @@ class TestAssertions:
         Args:
             response: The API response to check
             expected_type: Expected response type (e.g., 'text')
-            contains: List of strings that should be in the response text
+            contains: Strings that should be in the response text
 
         Raises:
             AssertionError: If response is invalid or missing expected content
@@ -59,8 +59,9 @@ class TestAssertions:
         assert response[0].type == expected_type, f"Response type should be '{expected_type}'"
 
         if contains and hasattr(response[0], "text"):
-            for text in contains:
-                assert text in response[0].text, f"Response should contain '{text}'"
+            response_text = response[0].text
+            missing = [text for text in contains if text not in response_text]
+            assert not missing, f"Response should contain {missing}"
 
     @staticmethod
     def assert_object_matches_attrs(obj: Any, expected_attrs: Dict[str, Any]) -> None:
@@ -207,6 +208,34 @@ class TestFactory:
             duration_ms=duration_ms,
         )
 
+    @staticmethod
+    def create_bundle_manager_mock(
+        *,
+        sbctl_available: bool = True,
+        metadata: Any = None,
+        api_available: bool = True,
+        active_bundle: Any = None,
+    ) -> Mock:
+        """
+        Create a BundleManager mock with the methods the server tools call.
+
+        Args:
+            sbctl_available: Result of _check_sbctl_available
+            metadata: Result of initialize_bundle
+            api_available: Result of check_api_server_available
+            active_bundle: Result of get_active_bundle
+
+        Returns:
+            Mock bundle manager
+        """
+        return Mock(
+            _check_sbctl_available=AsyncMock(return_value=sbctl_available),
+            initialize_bundle=AsyncMock(return_value=metadata),
+            check_api_server_available=AsyncMock(return_value=api_available),
+            get_diagnostic_info=AsyncMock(return_value={}),
+            get_active_bundle=Mock(return_value=active_bundle),
+        )
+
 
 @pytest.fixture
 def test_factory() -> TestFactory:
@@ -219,6 +248,219 @@ def test_factory() -> TestFactory:
     return TestFactory
 
 
+@pytest.fixture(scope="module")
+def bundle():
+    """
+    Provides an initialized bundle shared by the kubectl tests of a module.
+
+    The metadata is built with model_construct since the literal values are
+    already valid and none of the tests mutate it.
+    """
+    from mcp_server_troubleshoot.bundle import BundleMetadata
+
+    return BundleMetadata.model_construct(
+        id="test",
+        source="test",
+        path=Path("/test"),
+        kubeconfig_path=Path("/test/kubeconfig"),
+        initialized=True,
+        host_only_bundle=False,
+    )
+
+
+@pytest.fixture(scope="session")
+def dummy_source_path(tmp_path_factory) -> str:
+    """Provides the path of an existing, empty bundle file to use as a bundle source."""
+    path = tmp_path_factory.mktemp("bundles") / "src.tar.gz"
+    path.touch()
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def mock_metadata(tmp_path_factory, dummy_source_path):
+    """
+    Provides initialized bundle metadata whose source is dummy_source_path.
+
+    Args:
+        tmp_path_factory: Pytest factory for session temporary directories
+        dummy_source_path: Existing bundle file used as the source
+
+    Returns:
+        BundleMetadata instance
+    """
+    return TestFactory.create_bundle_metadata(
+        id="test_bundle",
+        source=dummy_source_path,
+        path=tmp_path_factory.mktemp("bundle"),
+    )
+
+
+@pytest.fixture(scope="module")
+def mock_kubectl_result():
+    """
+    Provides a successful JSON kubectl result for `get pods`.
+
+    This and the file result fixtures below use model_construct, like the bundle
+    fixture, since the literal values are already valid.
+    """
+    from mcp_server_troubleshoot.kubectl import KubectlResult
+
+    return KubectlResult.model_construct(
+        command="get pods",
+        exit_code=0,
+        stdout='{"items": []}',
+        stderr="",
+        output={"items": []},
+        is_json=True,
+        duration_ms=100,
+    )
+
+
+@pytest.fixture(scope="module")
+def mock_list_result():
+    """Provides a file listing of dir1 holding a single text file."""
+    from mcp_server_troubleshoot.files import FileInfo, FileListResult
+
+    file_info = FileInfo.model_construct(
+        name="file1.txt",
+        path="dir1/file1.txt",
+        type="file",
+        size=100,
+        access_time=123456789.0,
+        modify_time=123456789.0,
+        is_binary=False,
+    )
+    return FileListResult.model_construct(
+        path="dir1", entries=[file_info], recursive=False, total_files=1, total_dirs=0
+    )
+
+
+@pytest.fixture(scope="module")
+def mock_content_result():
+    """Provides the content of a single-line text file."""
+    from mcp_server_troubleshoot.files import FileContentResult
+
+    return FileContentResult.model_construct(
+        path="dir1/file1.txt",
+        content="This is the file content",
+        start_line=0,
+        end_line=0,
+        total_lines=1,
+        binary=False,
+    )
+
+
+@pytest.fixture(scope="module")
+def mock_grep_result():
+    """Provides a grep result with a single match."""
+    from mcp_server_troubleshoot.files import GrepMatch, GrepResult
+
+    grep_match = GrepMatch.model_construct(
+        path="dir1/file1.txt",
+        line_number=0,
+        line="This contains pattern",
+        match="pattern",
+        offset=13,
+    )
+    return GrepResult.model_construct(
+        pattern="pattern",
+        path="dir1",
+        glob_pattern="*.txt",
+        matches=[grep_match],
+        total_matches=1,
+        files_searched=1,
+        case_sensitive=False,
+        truncated=False,
+    )
+
+
+class FakeBundleManager:
+    """Minimal stand-in for BundleManager exposing only get_active_bundle."""
+
+    def __init__(self, bundle: Any) -> None:
+        self.bundle = bundle
+
+    def get_active_bundle(self) -> Any:
+        return self.bundle
+
+
+@pytest.fixture
+def bundle_manager(bundle):
+    """Provides a bundle manager whose active bundle is the shared test bundle."""
+    return FakeBundleManager(bundle)
+
+
+@pytest.fixture
+def no_bundle_manager():
+    """Provides a bundle manager with no active bundle."""
+    return FakeBundleManager(None)
+
+
+class FakeProcess:
+    """
+    Stand-in for asyncio.subprocess.Process that returns canned output.
+
+    Each spawn gets fresh StreamReader pipes fed with ``output``, so the kubectl
+    executor drains them as it would a real process, and wait() returns
+    ``returncode``. Each spawn is recorded in ``spawns`` as an ``(args, kwargs)``
+    tuple. Setting ``hang`` leaves the pipes open and makes wait() block forever,
+    for timeout tests; those tests can swap ``kill`` for a Mock to assert on it.
+    """
+
+    __slots__ = ("returncode", "output", "hang", "kill", "spawns", "stdout", "stderr")
+
+    def __init__(self, stdout: bytes = b"", stderr: bytes = b"", returncode: int = 0) -> None:
+        self.returncode = returncode
+        self.output = (stdout, stderr)
+        self.hang = False
+        self.kill: Callable[[], None] = lambda: None
+        self.spawns: List[Any] = []
+        self.stdout: Optional[asyncio.StreamReader] = None
+        self.stderr: Optional[asyncio.StreamReader] = None
+
+    def open_pipes(self) -> None:
+        """Create the stdout and stderr pipes for a new spawn, in the running loop."""
+        self.stdout, self.stderr = asyncio.StreamReader(), asyncio.StreamReader()
+        if self.hang:
+            return  # Never closed, so only a timeout ends the read
+        for pipe, data in zip((self.stdout, self.stderr), self.output):
+            pipe.feed_data(data)
+            pipe.feed_eof()
+
+    async def wait(self) -> int:
+        if self.hang:
+            await asyncio.Event().wait()  # Never set, so only a timeout ends the wait
+        return self.returncode
+
+
+@pytest.fixture
+def fake_kubectl_proc(request, monkeypatch) -> FakeProcess:
+    """
+    Replaces asyncio.create_subprocess_exec with a fake that returns one FakeProcess.
+
+    Tests choose the process output by parametrizing this fixture indirectly with a
+    ``(returncode, stdout, stderr)`` tuple; without a parameter the process exits 0
+    with no output.
+
+    Args:
+        request: The pytest request object
+        monkeypatch: The pytest monkeypatch fixture
+
+    Returns:
+        The FakeProcess every spawn returns
+    """
+    returncode, stdout, stderr = getattr(request, "param", (0, b"", b""))
+    process = FakeProcess(stdout=stdout, stderr=stderr, returncode=returncode)
+
+    async def fake_exec(*args: Any, **kwargs: Any) -> FakeProcess:
+        process.spawns.append((args, kwargs))
+        process.open_pipes()
+        return process
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", fake_exec)
+    return process
+
+
 @pytest.fixture
 def error_setup():
     """
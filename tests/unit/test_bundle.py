@@ -6,6 +6,7 @@ import json
 import os
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp  # Added import
@@ -18,6 +19,7 @@ from mcp_server_troubleshoot.bundle import (
     BundleManager,
     BundleMetadata,
     BundleNotFoundError,
+    DOWNLOAD_CHUNK_SIZE,
     InitializeBundleArgs,
 )
 
@@ -157,29 +159,48 @@ SIGNED_URL = "https://signed.example.com/download?token=abc"
 @pytest.fixture
 def mock_httpx_client():
     """Fixture to mock httpx.AsyncClient."""
-    mock_response = MagicMock(spec=httpx.Response)
-    # === START MODIFICATION ===
-    # Default behavior: json() raises error, status is 200 (will be overridden)
-    # mock_response.status_code = 200 # Removed duplicate/incorrectly indented line
+    # A plain namespace stands in for httpx.Response; only json() needs to be a
+    # mock, so tests can set its return value or side effect.
     # Default to success state, tests will override for error cases
-    mock_response.status_code = 200
-    # === START MODIFICATION ===
-    # Mock the CORRECT nested structure
     correct_response_data = {"bundle": {"signedUri": SIGNED_URL}}
-    mock_response.json = MagicMock(return_value=correct_response_data)
-    mock_response.text = json.dumps(correct_response_data)
-    # === END MODIFICATION ===
+    mock_response = SimpleNamespace(
+        status_code=200,
+        text=json.dumps(correct_response_data),
+        json=MagicMock(return_value=correct_response_data),
+    )
 
     mock_client = MagicMock(spec=httpx.AsyncClient)
+    mock_client.is_closed = False
     # Make the mock client's get method return the mock_response
-    mock_client.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
-    mock_client.__aexit__ = AsyncMock()
+    mock_client.get = AsyncMock(return_value=mock_response)
 
     with patch("httpx.AsyncClient", return_value=mock_client) as mock_constructor:
         # Yield the constructor and the response mock for tests to configure
         yield mock_constructor, mock_response
 
 
+@pytest.fixture
+def replicated_env(monkeypatch):
+    """
+    Set the bundle download token environment variables.
+
+    Only the token variables are touched, instead of replacing the whole
+    environment.
+
+    Returns:
+        A function taking a dict of token values; tokens not in it are unset
+    """
+
+    def set_tokens(tokens):
+        for name in ("SBCTL_TOKEN", "REPLICATED"):
+            if name in tokens:
+                monkeypatch.setenv(name, tokens[name])
+            else:
+                monkeypatch.delenv(name, raising=False)
+
+    return set_tokens
+
+
 @pytest.fixture
 def mock_aiohttp_download():
     """Fixture to mock the actual download part using aiohttp."""
@@ -226,7 +247,7 @@ def mock_aiohttp_download():
 
 @pytest.mark.asyncio
 async def test_bundle_manager_download_replicated_url_success_sbctl_token(
-    mock_httpx_client, mock_aiohttp_download
+    mock_httpx_client, mock_aiohttp_download, replicated_env
 ):
     """Test downloading from Replicated URL with SBCTL_TOKEN successfully."""
     mock_httpx_constructor, mock_httpx_response = mock_httpx_client
@@ -236,39 +257,40 @@ async def test_bundle_manager_download_replicated_url_success_sbctl_token(
         bundle_dir = Path(temp_dir)
         manager = BundleManager(bundle_dir)
 
-        with patch.dict(os.environ, {"SBCTL_TOKEN": "sbctl_token_value"}, clear=True):
-            download_path = await manager._download_bundle(REPLICATED_URL)
+        replicated_env({"SBCTL_TOKEN": "sbctl_token_value"})
+        download_path = await manager._download_bundle(REPLICATED_URL)
 
-            # Verify httpx call for signed URL
-            mock_httpx_constructor.assert_called_once()
-            # Check timeout was passed to httpx.AsyncClient
-            _, kwargs = mock_httpx_constructor.call_args
-            assert isinstance(kwargs.get("timeout"), httpx.Timeout)
+        # Verify httpx call for signed URL
+        mock_httpx_constructor.assert_called_once()
+        # Check timeout was passed to httpx.AsyncClient
+        _, kwargs = mock_httpx_constructor.call_args
+        assert isinstance(kwargs.get("timeout"), httpx.Timeout)
 
-            mock_get_call = mock_httpx_constructor.return_value.__aenter__.return_value.get
-            mock_get_call.assert_awaited_once_with(
-                REPLICATED_API_URL,
-                headers={"Authorization": "sbctl_token_value", "Content-Type": "application/json"},
-            )
+        mock_get_call = mock_httpx_constructor.return_value.get
+        mock_get_call.assert_awaited_once_with(
+            REPLICATED_API_URL,
+            headers={"Authorization": "sbctl_token_value", "Content-Type": "application/json"},
+        )
 
-            # Verify aiohttp call for actual download
-            mock_aiohttp_constructor.assert_called_once()
-            # Assert on the session's get method
-            mock_aio_session.get.assert_awaited_once_with(SIGNED_URL, headers={})
+        # Verify aiohttp call for actual download
+        mock_aiohttp_constructor.assert_called_once()
+        # Assert on the session's get method
+        mock_aio_session.get.assert_awaited_once_with(SIGNED_URL, headers={})
+        mock_aio_response.content.iter_chunked.assert_called_once_with(DOWNLOAD_CHUNK_SIZE)
 
-            # Verify file was created
-            assert download_path.exists()
-            # Assert new filename format
-            # Replace both '@' and ':' for the assertion to match sanitization
-            safe_slug_for_assertion = REPLICATED_SLUG.replace("@", "_").replace(":", "_")
-            expected_filename_part = f"replicated_bundle_{safe_slug_for_assertion}"
-            assert download_path.name.startswith(expected_filename_part)
-            assert download_path.read_bytes() == b"chunk1chunk2"
+        # Verify file was created
+        assert download_path.exists()
+        # Assert new filename format
+        # Replace both '@' and ':' for the assertion to match sanitization
+        safe_slug_for_assertion = REPLICATED_SLUG.replace("@", "_").replace(":", "_")
+        expected_filename_part = f"replicated_bundle_{safe_slug_for_assertion}"
+        assert download_path.name.startswith(expected_filename_part)
+        assert download_path.read_bytes() == b"chunk1chunk2"
 
 
 @pytest.mark.asyncio
 async def test_bundle_manager_download_replicated_url_success_replicated_token(
-    mock_httpx_client, mock_aiohttp_download
+    mock_httpx_client, mock_aiohttp_download, replicated_env
 ):
     """Test downloading from Replicated URL with REPLICATED_TOKEN successfully."""
     mock_httpx_constructor, mock_httpx_response = mock_httpx_client
@@ -279,25 +301,25 @@ async def test_bundle_manager_download_replicated_url_success_replicated_token(
         manager = BundleManager(bundle_dir)
 
         # Only REPLICATED is set
-        with patch.dict(os.environ, {"REPLICATED": "replicated_token_value"}, clear=True):
-            await manager._download_bundle(REPLICATED_URL)
-
-            # Verify httpx call used REPLICATED token
-            mock_get_call = mock_httpx_constructor.return_value.__aenter__.return_value.get
-            mock_get_call.assert_awaited_once_with(
-                REPLICATED_API_URL,
-                headers={
-                    "Authorization": "replicated_token_value",
-                    "Content-Type": "application/json",
-                },
-            )
-            # Verify aiohttp call used the signed URL
-            mock_aio_session.get.assert_awaited_once_with(SIGNED_URL, headers={})
+        replicated_env({"REPLICATED": "replicated_token_value"})
+        await manager._download_bundle(REPLICATED_URL)
+
+        # Verify httpx call used REPLICATED token
+        mock_get_call = mock_httpx_constructor.return_value.get
+        mock_get_call.assert_awaited_once_with(
+            REPLICATED_API_URL,
+            headers={
+                "Authorization": "replicated_token_value",
+                "Content-Type": "application/json",
+            },
+        )
+        # Verify aiohttp call used the signed URL
+        mock_aio_session.get.assert_awaited_once_with(SIGNED_URL, headers={})
 
 
 @pytest.mark.asyncio
 async def test_bundle_manager_download_replicated_url_token_precedence(
-    mock_httpx_client, mock_aiohttp_download
+    mock_httpx_client, mock_aiohttp_download, replicated_env
 ):
     """Test SBCTL_TOKEN takes precedence over REPLICATED_TOKEN."""
     mock_httpx_constructor, _ = mock_httpx_client
@@ -309,44 +331,59 @@ async def test_bundle_manager_download_replicated_url_token_precedence(
         manager = BundleManager(bundle_dir)
 
         # Both tokens are set
-        with patch.dict(
-            os.environ,
-            # === START MODIFICATION ===
-            {"SBCTL_TOKEN": "sbctl_token_value", "REPLICATED": "replicated_token_value"},
-            # === END MODIFICATION ===
-            clear=True,
-        ):
-            await manager._download_bundle(REPLICATED_URL)
+        replicated_env({"SBCTL_TOKEN": "sbctl_token_value", "REPLICATED": "replicated_token_value"})
+        await manager._download_bundle(REPLICATED_URL)
+
+        # Verify httpx call used SBCTL_TOKEN
+        mock_get_call = mock_httpx_constructor.return_value.get
+        mock_get_call.assert_awaited_once_with(
+            REPLICATED_API_URL,
+            headers={"Authorization": "sbctl_token_value", "Content-Type": "application/json"},
+        )
 
-            # Verify httpx call used SBCTL_TOKEN
-            mock_get_call = mock_httpx_constructor.return_value.__aenter__.return_value.get
-            mock_get_call.assert_awaited_once_with(
-                REPLICATED_API_URL,
-                headers={"Authorization": "sbctl_token_value", "Content-Type": "application/json"},
-            )
+
+@pytest.mark.asyncio
+async def test_bundle_manager_replicated_http_client_reused(mock_httpx_client, replicated_env):
+    """Test that Replicated API calls share one HTTP client until it is closed."""
+    mock_httpx_constructor, _ = mock_httpx_client
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = BundleManager(Path(temp_dir))
+
+        replicated_env({"SBCTL_TOKEN": "sbctl_token_value"})
+        assert await manager._get_replicated_signed_url(REPLICATED_URL) == SIGNED_URL
+        assert await manager._get_replicated_signed_url(REPLICATED_URL) == SIGNED_URL
+
+        mock_httpx_constructor.assert_called_once()
+        assert mock_httpx_constructor.return_value.get.await_count == 2
+
+        # A closed client is replaced on the next call
+        mock_httpx_constructor.return_value.is_closed = True
+        await manager._get_replicated_signed_url(REPLICATED_URL)
+        assert mock_httpx_constructor.call_count == 2
 
 
 @pytest.mark.asyncio
-async def test_bundle_manager_download_replicated_url_missing_token():
+async def test_bundle_manager_download_replicated_url_missing_token(replicated_env):
     """Test error handling when no token is provided for Replicated URL."""
     with tempfile.TemporaryDirectory() as temp_dir:
         bundle_dir = Path(temp_dir)
         manager = BundleManager(bundle_dir)
 
         # No tokens set
-        with patch.dict(os.environ, {}, clear=True):
-            with pytest.raises(BundleDownloadError) as excinfo:
-                await manager._download_bundle(REPLICATED_URL)
-            # === START MODIFICATION ===
-            # Update assertion to match the exact error message and correct ENV name
-            expected_error_part = "SBCTL_TOKEN or REPLICATED environment variable not set"
-            assert expected_error_part in str(excinfo.value)
-            assert "Cannot download from Replicated Vendor Portal" in str(excinfo.value)
-            # === END MODIFICATION ===
+        replicated_env({})
+        with pytest.raises(BundleDownloadError) as excinfo:
+            await manager._download_bundle(REPLICATED_URL)
+        # === START MODIFICATION ===
+        # Update assertion to match the exact error message and correct ENV name
+        expected_error_part = "SBCTL_TOKEN or REPLICATED environment variable not set"
+        assert expected_error_part in str(excinfo.value)
+        assert "Cannot download from Replicated Vendor Portal" in str(excinfo.value)
+        # === END MODIFICATION ===
 
 
 @pytest.mark.asyncio
-async def test_bundle_manager_download_replicated_url_api_401(mock_httpx_client):
+async def test_bundle_manager_download_replicated_url_api_401(mock_httpx_client, replicated_env):
     """Test error handling for Replicated API 401 Unauthorized."""
     mock_httpx_constructor, mock_response = mock_httpx_client
     # === START MODIFICATION ===
@@ -361,18 +398,18 @@ async def test_bundle_manager_download_replicated_url_api_401(mock_httpx_client)
         bundle_dir = Path(temp_dir)
         manager = BundleManager(bundle_dir)
 
-        with patch.dict(os.environ, {"SBCTL_TOKEN": "bad_token"}, clear=True):
-            with pytest.raises(BundleDownloadError) as excinfo:
-                # === START MODIFICATION ===
-                # Call _download_bundle instead of _get_replicated_signed_url
-                await manager._download_bundle(REPLICATED_URL)
-                # === END MODIFICATION ===
-            # The error should propagate from _get_replicated_signed_url
-            assert "Failed to authenticate with Replicated API (status 401)" in str(excinfo.value)
+        replicated_env({"SBCTL_TOKEN": "bad_token"})
+        with pytest.raises(BundleDownloadError) as excinfo:
+            # === START MODIFICATION ===
+            # Call _download_bundle instead of _get_replicated_signed_url
+            await manager._download_bundle(REPLICATED_URL)
+            # === END MODIFICATION ===
+        # The error should propagate from _get_replicated_signed_url
+        assert "Failed to authenticate with Replicated API (status 401)" in str(excinfo.value)
 
 
 @pytest.mark.asyncio
-async def test_bundle_manager_download_replicated_url_api_404(mock_httpx_client):
+async def test_bundle_manager_download_replicated_url_api_404(mock_httpx_client, replicated_env):
     """Test error handling for Replicated API 404 Not Found."""
     mock_httpx_constructor, mock_response = mock_httpx_client
     # === START MODIFICATION ===
@@ -385,18 +422,20 @@ async def test_bundle_manager_download_replicated_url_api_404(mock_httpx_client)
         bundle_dir = Path(temp_dir)
         manager = BundleManager(bundle_dir)
 
-        with patch.dict(os.environ, {"SBCTL_TOKEN": "good_token"}, clear=True):
-            with pytest.raises(BundleDownloadError) as excinfo:
-                # === START MODIFICATION ===
-                # Call _download_bundle instead of _get_replicated_signed_url
-                await manager._download_bundle(REPLICATED_URL)
-                # === END MODIFICATION ===
-            assert "Support bundle not found on Replicated Vendor Portal" in str(excinfo.value)
-            assert f"slug: {REPLICATED_SLUG}" in str(excinfo.value)
+        replicated_env({"SBCTL_TOKEN": "good_token"})
+        with pytest.raises(BundleDownloadError) as excinfo:
+            # === START MODIFICATION ===
+            # Call _download_bundle instead of _get_replicated_signed_url
+            await manager._download_bundle(REPLICATED_URL)
+            # === END MODIFICATION ===
+        assert "Support bundle not found on Replicated Vendor Portal" in str(excinfo.value)
+        assert f"slug: {REPLICATED_SLUG}" in str(excinfo.value)
 
 
 @pytest.mark.asyncio
-async def test_bundle_manager_download_replicated_url_api_other_error(mock_httpx_client):
+async def test_bundle_manager_download_replicated_url_api_other_error(
+    mock_httpx_client, replicated_env
+):
     """Test error handling for other Replicated API errors."""
     mock_httpx_constructor, mock_response = mock_httpx_client
     # === START MODIFICATION ===
@@ -409,18 +448,20 @@ async def test_bundle_manager_download_replicated_url_api_other_error(mock_httpx
         bundle_dir = Path(temp_dir)
         manager = BundleManager(bundle_dir)
 
-        with patch.dict(os.environ, {"SBCTL_TOKEN": "good_token"}, clear=True):
-            with pytest.raises(BundleDownloadError) as excinfo:
-                # === START MODIFICATION ===
-                # Call _download_bundle instead of _get_replicated_signed_url
-                await manager._download_bundle(REPLICATED_URL)
-                # === END MODIFICATION ===
-            assert "Failed to get signed URL from Replicated API (status 500)" in str(excinfo.value)
-            assert "Internal Server Error" in str(excinfo.value)  # Check response text included
+        replicated_env({"SBCTL_TOKEN": "good_token"})
+        with pytest.raises(BundleDownloadError) as excinfo:
+            # === START MODIFICATION ===
+            # Call _download_bundle instead of _get_replicated_signed_url
+            await manager._download_bundle(REPLICATED_URL)
+            # === END MODIFICATION ===
+        assert "Failed to get signed URL from Replicated API (status 500)" in str(excinfo.value)
+        assert "Internal Server Error" in str(excinfo.value)  # Check response text included
 
 
 @pytest.mark.asyncio
-async def test_bundle_manager_download_replicated_url_missing_signed_uri(mock_httpx_client):
+async def test_bundle_manager_download_replicated_url_missing_signed_uri(
+    mock_httpx_client, replicated_env
+):
     """Test error handling when 'signedUri' is missing from API response."""
     mock_httpx_constructor, mock_response = mock_httpx_client
     # Configure for success status but missing key in the nested JSON
@@ -436,17 +477,17 @@ async def test_bundle_manager_download_replicated_url_missing_signed_uri(mock_ht
         bundle_dir = Path(temp_dir)
         manager = BundleManager(bundle_dir)
 
-        with patch.dict(os.environ, {"SBCTL_TOKEN": "good_token"}, clear=True):
-            with pytest.raises(BundleDownloadError) as excinfo:
-                # === START MODIFICATION ===
-                # Call _download_bundle instead of _get_replicated_signed_url
-                await manager._download_bundle(REPLICATED_URL)
-                # === END MODIFICATION ===
-            assert "Could not find 'signedUri' in Replicated API response" in str(excinfo.value)
+        replicated_env({"SBCTL_TOKEN": "good_token"})
+        with pytest.raises(BundleDownloadError) as excinfo:
+            # === START MODIFICATION ===
+            # Call _download_bundle instead of _get_replicated_signed_url
+            await manager._download_bundle(REPLICATED_URL)
+            # === END MODIFICATION ===
+        assert "Could not find 'signedUri' in Replicated API response" in str(excinfo.value)
 
 
 @pytest.mark.asyncio
-async def test_bundle_manager_download_replicated_url_network_error():
+async def test_bundle_manager_download_replicated_url_network_error(replicated_env):
     """Test error handling for network errors during Replicated API call."""
     # === START MODIFICATION ===
     # Patch the 'get' method directly to raise the network error
@@ -457,19 +498,19 @@ async def test_bundle_manager_download_replicated_url_network_error():
             bundle_dir = Path(temp_dir)
             manager = BundleManager(bundle_dir)
 
-            with patch.dict(os.environ, {"SBCTL_TOKEN": "good_token"}, clear=True):
-                with pytest.raises(BundleDownloadError) as excinfo:
-                    # Call _download_bundle which calls _get_replicated_signed_url
-                    await manager._download_bundle(REPLICATED_URL)
+            replicated_env({"SBCTL_TOKEN": "good_token"})
+            with pytest.raises(BundleDownloadError) as excinfo:
+                # Call _download_bundle which calls _get_replicated_signed_url
+                await manager._download_bundle(REPLICATED_URL)
 
-                # Assert that the correct error (raised by the except httpx.RequestError block) is caught
-                assert "Network error requesting signed URL" in str(excinfo.value)
-                assert "Network timeout" in str(excinfo.value)  # Check original error is included
+            # Assert that the correct error (raised by the except httpx.RequestError block) is caught
+            assert "Network error requesting signed URL" in str(excinfo.value)
+            assert "Network timeout" in str(excinfo.value)  # Check original error is included
     # === END MODIFICATION ===
 
 
 @pytest.mark.asyncio
-async def test_bundle_manager_download_non_replicated_url(mock_aiohttp_download):
+async def test_bundle_manager_download_non_replicated_url(mock_aiohttp_download, replicated_env):
     """Test that non-Replicated URLs are downloaded directly without API calls."""
     mock_aiohttp_constructor, mock_aio_session, mock_aio_response = mock_aiohttp_download
     non_replicated_url = "https://normal.example.com/bundle.tar.gz"
@@ -480,28 +521,30 @@ async def test_bundle_manager_download_non_replicated_url(mock_aiohttp_download)
 
         # Mock httpx to ensure it's NOT called
         with patch("httpx.AsyncClient") as mock_httpx_constructor:
-            with patch.dict(os.environ, {"SBCTL_TOKEN": "token_val"}, clear=True):
-                download_path = await manager._download_bundle(non_replicated_url)
+            replicated_env({"SBCTL_TOKEN": "token_val"})
+            download_path = await manager._download_bundle(non_replicated_url)
 
-                # Verify httpx was NOT called
-                mock_httpx_constructor.assert_not_called()
+            # Verify httpx was NOT called
+            mock_httpx_constructor.assert_not_called()
 
-                # Verify aiohttp was called with the original URL and token
-                mock_aio_session.get.assert_awaited_once_with(
-                    non_replicated_url, headers={"Authorization": "Bearer token_val"}
-                )
+            # Verify aiohttp was called with the original URL and token
+            mock_aio_session.get.assert_awaited_once_with(
+                non_replicated_url, headers={"Authorization": "Bearer token_val"}
+            )
 
-                # Verify file was created
-                assert download_path.exists()
-                assert download_path.name == "bundle.tar.gz"
-                assert download_path.read_bytes() == b"chunk1chunk2"
+            # Verify file was created
+            assert download_path.exists()
+            assert download_path.name == "bundle.tar.gz"
+            assert download_path.read_bytes() == b"chunk1chunk2"
 
 
 # --- End Replicated Vendor Portal Tests ---
 
 
 @pytest.mark.asyncio
-async def test_bundle_manager_download_bundle(mock_aiohttp_download):  # Use fixture as argument
+async def test_bundle_manager_download_bundle(
+    mock_aiohttp_download, replicated_env
+):  # Use fixture as argument
     """Test that the bundle manager can download a non-Replicated bundle."""
     # Unpack the fixture results
     mock_aiohttp_constructor, mock_aio_session, mock_aio_response = mock_aiohttp_download
@@ -517,24 +560,24 @@ async def test_bundle_manager_download_bundle(mock_aiohttp_download):  # Use fix
         manager._wait_for_initialization = AsyncMock()  # Also mock wait
 
         # Call initialize_bundle which internally calls _download_bundle
-        with patch.dict(os.environ, {"SBCTL_TOKEN": "token_val"}, clear=True):
-            result = await manager.initialize_bundle(non_replicated_url)
+        replicated_env({"SBCTL_TOKEN": "token_val"})
+        result = await manager.initialize_bundle(non_replicated_url)
 
-            # Verify aiohttp was called correctly by _download_bundle
-            mock_aio_session.get.assert_awaited_once_with(
-                non_replicated_url, headers={"Authorization": "Bearer token_val"}
-            )
+        # Verify aiohttp was called correctly by _download_bundle
+        mock_aio_session.get.assert_awaited_once_with(
+            non_replicated_url, headers={"Authorization": "Bearer token_val"}
+        )
 
-            # Verify the result of initialize_bundle
-            assert isinstance(result, BundleMetadata)
-            assert result.source == non_replicated_url
-            assert result.kubeconfig_path == kubeconfig_path
-            # Check that the bundle path inside the metadata points to the downloaded file's dir
-            expected_bundle_dir_name_part = "bundle_"  # From filename generation
-            assert expected_bundle_dir_name_part in result.path.name
-            # Check the generated filename used for download path
-            expected_filename = "bundle.tar.gz"  # Based on URL parsing
-            assert (manager.bundle_dir / expected_filename).exists()
+        # Verify the result of initialize_bundle
+        assert isinstance(result, BundleMetadata)
+        assert result.source == non_replicated_url
+        assert result.kubeconfig_path == kubeconfig_path
+        # Check that the bundle path inside the metadata points to the downloaded file's dir
+        expected_bundle_dir_name_part = "bundle_"  # From filename generation
+        assert expected_bundle_dir_name_part in result.path.name
+        # Check the generated filename used for download path
+        expected_filename = "bundle.tar.gz"  # Based on URL parsing
+        assert (manager.bundle_dir / expected_filename).exists()
 
 
 @pytest.mark.asyncio
@@ -946,3 +989,30 @@ async def test_bundle_metadata_host_only_field():
     )
 
     assert host_only_metadata.host_only_bundle is True
+
+
+def test_extract_bundle_archive_sanitizes_member_paths():
+    """Test that bundle extraction counts members and strips unsafe path prefixes."""
+    import io
+    import tarfile
+
+    from mcp_server_troubleshoot.bundle import _extract_bundle_archive
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bundle_path = Path(temp_dir) / "bundle.tar.gz"
+        with tarfile.open(bundle_path, "w:gz") as tar:
+            for name, data in (
+                ("support-bundle/cluster-resources/pods.json", b"{}"),
+                ("../escaped.txt", b"outside"),
+            ):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+
+        extract_dir = Path(temp_dir) / "extracted"
+        extract_dir.mkdir()
+
+        assert _extract_bundle_archive(bundle_path, extract_dir) == 2
+        assert (extract_dir / "support-bundle/cluster-resources/pods.json").read_bytes() == b"{}"
+        assert (extract_dir / "escaped.txt").read_bytes() == b"outside"
+        assert not (Path(temp_dir) / "escaped.txt").exists()
@@ -134,6 +134,22 @@ def test_grep_files_args_validation():
         GrepFilesArgs(pattern="test", path="dir1", max_files=0)
 
 
+@pytest.mark.parametrize(
+    "args",
+    [
+        ListFilesArgs(path="dir1"),
+        ReadFileArgs(path="dir1/file1.txt"),
+        GrepFilesArgs(pattern="test", path="dir1"),
+    ],
+    ids=["list-files", "read-file", "grep-files"],
+)
+def test_file_args_are_frozen(args):
+    """Test that validated file operation arguments cannot be modified."""
+    with pytest.raises(ValidationError):
+        args.path = "../outside"
+    assert args.path != "../outside"
+
+
 @pytest.mark.asyncio
 async def test_file_explorer_list_files(test_file_setup):
     """
@@ -18,13 +18,12 @@ The tests focus on three main user workflows:
 Each test verifies both normal operation and proper error handling.
 """
 
-from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
 from pydantic import ValidationError
 
-from mcp_server_troubleshoot.bundle import BundleManager, BundleMetadata
+from mcp_server_troubleshoot.bundle import BundleManager
 from mcp_server_troubleshoot.files import (
     FileContentResult,
     FileExplorer,
@@ -45,16 +44,17 @@ pytestmark = pytest.mark.unit
 
 # Parameterized validation tests for ListFilesArgs
 @pytest.mark.parametrize(
-    "path,recursive,expected_valid",
+    "path,recursive,expected_valid,match_pattern",
     [
         # Valid cases
-        ("dir1", False, True),
-        ("dir1/subdir", True, True),
-        ("absolute/path", True, True),  # Note: without leading slash - the validator removes it
+        ("dir1", False, True, None),
+        ("dir1/subdir", True, True, None),
+        # Note: without leading slash - the validator removes it
+        ("absolute/path", True, True, None),
         # Invalid cases
-        ("", False, False),  # Empty path
-        ("../outside", False, False),  # Path traversal
-        ("dir1/../../../outside", False, False),  # Path traversal
+        ("", False, False, "Path cannot be empty"),
+        ("../outside", False, False, "directory traversal"),
+        ("dir1/../../../outside", False, False, "directory traversal"),
     ],
     ids=[
         "valid-simple-path",
@@ -65,7 +65,7 @@ pytestmark = pytest.mark.unit
         "invalid-complex-traversal",
     ],
 )
-def test_list_files_args_validation_parametrized(path, recursive, expected_valid):
+def test_list_files_args_validation_parametrized(path, recursive, expected_valid, match_pattern):
     """
     Test ListFilesArgs validation with parameterized test cases.
 
@@ -76,6 +76,7 @@ def test_list_files_args_validation_parametrized(path, recursive, expected_valid
         path: Directory path to validate
         recursive: Whether to recursively list files
         expected_valid: Whether validation should pass
+        match_pattern: Message expected from the failing validator
     """
     if expected_valid:
         # Should succeed
@@ -83,29 +84,25 @@ def test_list_files_args_validation_parametrized(path, recursive, expected_valid
         assert args.path == path
         assert args.recursive == recursive
     else:
-        # Should raise ValidationError
-        with pytest.raises(ValidationError):
+        # Should raise ValidationError from the expected validator
+        with pytest.raises(ValidationError, match=match_pattern):
             ListFilesArgs(path=path, recursive=recursive)
 
 
 # Parameterized validation tests for ReadFileArgs
 @pytest.mark.parametrize(
-    "path,start_line,end_line,expected_valid",
+    "path,start_line,end_line,expected_valid,match_pattern",
     [
         # Valid cases
-        ("file.txt", 0, 10, True),
-        ("dir/file.txt", 5, 15, True),
-        (
-            "absolute/path/file.txt",
-            0,
-            100,
-            True,
-        ),  # Note: without leading slash - the validator removes it
+        ("file.txt", 0, 10, True, None),
+        ("dir/file.txt", 5, 15, True, None),
+        # Note: without leading slash - the validator removes it
+        ("absolute/path/file.txt", 0, 100, True, None),
         # Invalid cases
-        ("", 0, 10, False),  # Empty path
-        ("../outside.txt", 0, 10, False),  # Path traversal
-        ("file.txt", -1, 10, False),  # Negative start_line
-        ("file.txt", 0, -1, False),  # Negative end_line
+        ("", 0, 10, False, "Path cannot be empty"),
+        ("../outside.txt", 0, 10, False, "directory traversal"),
+        ("file.txt", -1, 10, False, "start_line must be non-negative"),
+        ("file.txt", 0, -1, False, "end_line must be non-negative"),
     ],
     ids=[
         "valid-simple-file",
@@ -117,7 +114,9 @@ def test_list_files_args_validation_parametrized(path, recursive, expected_valid
         "invalid-negative-end",
     ],
 )
-def test_read_file_args_validation_parametrized(path, start_line, end_line, expected_valid):
+def test_read_file_args_validation_parametrized(
+    path, start_line, end_line, expected_valid, match_pattern
+):
     """
     Test ReadFileArgs validation with parameterized test cases.
 
@@ -128,6 +127,7 @@ def test_read_file_args_validation_parametrized(path, start_line, end_line, expe
         start_line: Starting line number
         end_line: Ending line number
         expected_valid: Whether validation should pass
+        match_pattern: Message expected from the failing validator
     """
     if expected_valid:
         # Should succeed
@@ -136,23 +136,24 @@ def test_read_file_args_validation_parametrized(path, start_line, end_line, expe
         assert args.start_line == start_line
         assert args.end_line == end_line
     else:
-        # Should raise ValidationError
-        with pytest.raises(ValidationError):
+        # Should raise ValidationError from the expected validator
+        with pytest.raises(ValidationError, match=match_pattern):
             ReadFileArgs(path=path, start_line=start_line, end_line=end_line)
 
 
 # Parameterized validation tests for GrepFilesArgs
 @pytest.mark.parametrize(
-    "pattern,path,recursive,glob_pattern,case_sensitive,max_results,expected_valid",
+    "pattern,path,recursive,glob_pattern,case_sensitive,max_results,expected_valid,match_pattern",
     [
         # Valid cases
-        ("test", "dir1", True, "*.txt", False, 100, True),
-        ("complex.pattern", ".", True, None, True, 50, True),  # Use "." for root directory
-        ("foo", "dir1/subdir", False, "*.log", False, 10, True),
+        ("test", "dir1", True, "*.txt", False, 100, True, None),
+        # Use "." for root directory
+        ("complex.pattern", ".", True, None, True, 50, True, None),
+        ("foo", "dir1/subdir", False, "*.log", False, 10, True, None),
         # Invalid cases
-        ("", "dir1", True, "*.txt", False, 100, False),  # Empty pattern
-        ("test", ".", True, "*.txt", False, 0, False),  # Max results too small
-        ("test", "../outside", True, "*.txt", False, 100, False),  # Path traversal
+        ("", "dir1", True, "*.txt", False, 100, False, "Pattern cannot be empty"),
+        ("test", ".", True, "*.txt", False, 0, False, "max_results must be positive"),
+        ("test", "../outside", True, "*.txt", False, 100, False, "directory traversal"),
     ],
     ids=[
         "valid-standard-grep",
@@ -164,7 +165,14 @@ def test_read_file_args_validation_parametrized(path, start_line, end_line, expe
     ],
 )
 def test_grep_files_args_validation_parametrized(
-    pattern, path, recursive, glob_pattern, case_sensitive, max_results, expected_valid
+    pattern,
+    path,
+    recursive,
+    glob_pattern,
+    case_sensitive,
+    max_results,
+    expected_valid,
+    match_pattern,
 ):
     """
     Test GrepFilesArgs validation with parameterized test cases.
@@ -179,6 +187,7 @@ def test_grep_files_args_validation_parametrized(
         case_sensitive: Whether to use case-sensitive search
         max_results: Maximum results to return
         expected_valid: Whether validation should pass
+        match_pattern: Message expected from the failing validator
     """
     if expected_valid:
         # Should succeed
@@ -197,8 +206,8 @@ def test_grep_files_args_validation_parametrized(
         assert args.case_sensitive == case_sensitive
         assert args.max_results == max_results
     else:
-        # Should raise ValidationError
-        with pytest.raises(ValidationError):
+        # Should raise ValidationError from the expected validator
+        with pytest.raises(ValidationError, match=match_pattern):
             GrepFilesArgs(
                 pattern=pattern,
                 path=path,
@@ -209,129 +218,126 @@ def test_grep_files_args_validation_parametrized(
             )
 
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize(
-    "path,is_directory,exists,expected_error",
-    [
-        # Success case - directory exists
-        ("dir1", True, True, None),
-        # Error case - path doesn't exist
-        ("nonexistent", True, False, PathNotFoundError),
-        # Error case - path is a file, not a directory
-        (
-            "file.txt",
-            False,
-            True,
-            FileSystemError,
-        ),  # Note: Changed from ReadFileError to FileSystemError
-    ],
-    ids=[
-        "valid-directory",
-        "invalid-nonexistent",
-        "invalid-not-directory",
-    ],
-)
-async def test_file_explorer_list_files_error_handling(
-    path, is_directory, exists, expected_error, test_file_setup, test_factory
-):
+@pytest.fixture
+def explorer_operation(request, test_file_setup, test_factory):
     """
-    Test that the file explorer handles listing errors correctly with parameterization.
+    Provides a bound FileExplorer method for indirect parametrization.
 
-    This test verifies error conditions for directory listings are handled properly.
+    The explorer is wired to a bundle rooted at test_file_setup, so test
+    bodies only need to call the returned operation.
 
     Args:
-        path: Path to list
-        is_directory: Whether the path is a directory
-        exists: Whether the path exists
-        expected_error: Expected error type or None for success
+        request: Pytest request whose param names the FileExplorer method
         test_file_setup: Fixture that provides a test directory with files
         test_factory: Factory for test objects
-    """
-    # Replace "dir1" with actual directory, "file.txt" with actual file
-    if path == "dir1" and exists and is_directory:
-        actual_path = "dir1"  # This exists in the test_file_setup
-    elif path == "file.txt" and exists and not is_directory:
-        actual_path = "dir1/file1.txt"  # This exists in the test_file_setup
-    else:
-        actual_path = path  # Use as is for non-existent paths
 
-    # Set up the bundle manager
+    Returns:
+        The requested FileExplorer coroutine method
+    """
     bundle_manager = Mock(spec=BundleManager)
-    bundle = test_factory.create_bundle_metadata(path=test_file_setup)
-    bundle_manager.get_active_bundle.return_value = bundle
-
-    # Create file explorer
-    explorer = FileExplorer(bundle_manager)
-
-    if expected_error:
-        # Should raise an error
-        with pytest.raises(expected_error):
-            await explorer.list_files(actual_path, False)
-    else:
-        # Should succeed
-        result = await explorer.list_files(actual_path, False)
-        assert isinstance(result, FileListResult)
-        assert result.path == actual_path
-        assert result.total_files >= 0
-        assert result.total_dirs >= 0
-        assert len(result.entries) == result.total_files + result.total_dirs
+    bundle_manager.get_active_bundle.return_value = test_factory.create_bundle_metadata(
+        path=test_file_setup
+    )
+    return getattr(FileExplorer(bundle_manager), request.param)
 
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
-    "path,exists,is_file,is_directory,expected_error",
+    "explorer_operation,args,expected_error",
     [
+        # Success case - directory exists
+        ("list_files", ("dir1", False), None),
+        # Error case - path doesn't exist
+        ("list_files", ("nonexistent", False), PathNotFoundError),
+        # Error case - path is a file, not a directory
+        ("list_files", ("dir1/file1.txt", False), FileSystemError),
         # Success case - file exists
-        ("dir1/file1.txt", True, True, False, None),
+        ("read_file", ("dir1/file1.txt",), None),
         # Error case - path doesn't exist
-        ("nonexistent.txt", False, False, False, PathNotFoundError),
+        ("read_file", ("nonexistent.txt",), PathNotFoundError),
         # Error case - path is a directory, not a file
-        ("dir1", True, False, True, ReadFileError),
+        ("read_file", ("dir1",), ReadFileError),
     ],
     ids=[
-        "valid-file",
-        "invalid-nonexistent",
-        "invalid-directory",
+        "list-valid-directory",
+        "list-invalid-nonexistent",
+        "list-invalid-not-directory",
+        "read-valid-file",
+        "read-invalid-nonexistent",
+        "read-invalid-directory",
     ],
+    indirect=["explorer_operation"],
 )
-async def test_file_explorer_read_file_error_handling(
-    path, exists, is_file, is_directory, expected_error, test_file_setup, test_factory
-):
+async def test_file_explorer_error_handling(explorer_operation, args, expected_error):
     """
-    Test that the file explorer handles read errors correctly with parameterization.
+    Test that the file explorer handles listing and read errors correctly.
 
-    This test verifies error conditions for file reading are handled properly.
+    Both operations share the same setup, so they are driven from a single
+    table and the explorer method is resolved by the explorer_operation fixture.
 
     Args:
-        path: Path to read
-        exists: Whether the path exists
-        is_file: Whether the path is a file
-        is_directory: Whether the path is a directory
+        explorer_operation: FileExplorer method under test
+        args: Positional arguments for the method
         expected_error: Expected error type or None for success
-        test_file_setup: Fixture that provides a test directory with files
-        test_factory: Factory for test objects
     """
-    # Set up the bundle manager
-    bundle_manager = Mock(spec=BundleManager)
-    bundle = test_factory.create_bundle_metadata(path=test_file_setup)
-    bundle_manager.get_active_bundle.return_value = bundle
-
-    # Create file explorer
-    explorer = FileExplorer(bundle_manager)
-
     if expected_error:
         # Should raise an error
         with pytest.raises(expected_error):
-            await explorer.read_file(path)
+            await explorer_operation(*args)
+        return
+
+    # Should succeed
+    result = await explorer_operation(*args)
+    assert result.path == args[0]
+    if isinstance(result, FileListResult):
+        assert result.total_files >= 0
+        assert result.total_dirs >= 0
+        assert len(result.entries) == result.total_files + result.total_dirs
     else:
-        # Should succeed
-        result = await explorer.read_file(path)
         assert isinstance(result, FileContentResult)
-        assert result.path == path
         assert result.content is not None
         assert result.binary is False  # Our test files are text files
 
 
+# Contents of the file searched by the grep behavior tests
+SEARCH_TEXT = (
+    "This file contains search patterns\n"
+    "UPPERCASE text for case sensitivity tests\n"
+    "lowercase text for the same\n"
+    "Multiple instances of the word pattern\n"
+    "pattern appears again here\n"
+)
+
+
+@pytest.fixture(scope="module")
+def grep_bundle(tmp_path_factory):
+    """
+    Provides a bundle containing the grep corpus.
+
+    The grep tests only read the corpus, so it is written once per module
+    instead of rebuilding the full test_file_setup tree for every case.
+
+    Args:
+        tmp_path_factory: Pytest factory for module-lifetime temporary directories
+
+    Returns:
+        BundleMetadata for the bundle holding dir1/search.txt
+    """
+    from mcp_server_troubleshoot.bundle import BundleMetadata
+
+    bundle_dir = tmp_path_factory.mktemp("grep")
+    (bundle_dir / "dir1").mkdir()
+    (bundle_dir / "dir1" / "search.txt").write_text(SEARCH_TEXT)
+
+    return BundleMetadata(
+        id="test",
+        source="test",
+        path=bundle_dir,
+        kubeconfig_path=bundle_dir / "kubeconfig",
+        initialized=True,
+    )
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "path,pattern,case_sensitive,contains_match",
@@ -353,7 +359,7 @@ async def test_file_explorer_read_file_error_handling(
     ],
 )
 async def test_file_explorer_grep_files_behavior(
-    path, pattern, case_sensitive, contains_match, test_file_setup, test_factory
+    path, pattern, case_sensitive, contains_match, grep_bundle
 ):
     """
     Test grep functionality with different patterns and case sensitivity.
@@ -365,13 +371,11 @@ async def test_file_explorer_grep_files_behavior(
         pattern: Search pattern
         case_sensitive: Whether search is case-sensitive
         contains_match: Whether matches should be found
-        test_file_setup: Fixture that provides a test directory with files
-        test_factory: Factory for test objects
+        grep_bundle: Shared bundle holding the grep corpus
     """
     # Set up the bundle manager
     bundle_manager = Mock(spec=BundleManager)
-    bundle = test_factory.create_bundle_metadata(path=test_file_setup)
-    bundle_manager.get_active_bundle.return_value = bundle
+    bundle_manager.get_active_bundle.return_value = grep_bundle
 
     # Create file explorer
     explorer = FileExplorer(bundle_manager)
@@ -401,6 +405,33 @@ async def test_file_explorer_grep_files_behavior(
         assert len(result.matches) == 0
 
 
+@pytest.fixture(scope="module")
+def normalization_bundle(tmp_path_factory):
+    """
+    Provides a bundle for the path normalization tests.
+
+    Path normalization never touches file contents, so a single bundle
+    rooted in an empty directory is shared by every case in the module.
+
+    Args:
+        tmp_path_factory: Pytest factory for module-lifetime temporary directories
+
+    Returns:
+        BundleMetadata for the shared bundle directory
+    """
+    from pathlib import Path
+
+    from mcp_server_troubleshoot.bundle import BundleMetadata
+
+    return BundleMetadata(
+        id="test",
+        source="test",
+        path=tmp_path_factory.mktemp("normalization"),
+        kubeconfig_path=Path("/test/kubeconfig"),
+        initialized=True,
+    )
+
+
 @pytest.mark.parametrize(
     "path,expected_traversal",
     [
@@ -426,7 +457,7 @@ async def test_file_explorer_grep_files_behavior(
         "invalid-triple-traversal",
     ],
 )
-def test_file_explorer_path_normalization(path, expected_traversal, test_file_setup):
+def test_file_explorer_path_normalization(path, expected_traversal, normalization_bundle):
     """
     Test path normalization for security vulnerabilities.
 
@@ -435,18 +466,13 @@ def test_file_explorer_path_normalization(path, expected_traversal, test_file_se
     Args:
         path: Path to normalize
         expected_traversal: Whether path contains directory traversal
-        test_file_setup: Fixture that provides a test directory with files
+        normalization_bundle: Shared bundle metadata for normalization cases
     """
+    bundle_dir = normalization_bundle.path
+
     # Create a bundle manager and explorer
     bundle_manager = Mock(spec=BundleManager)
-    bundle = BundleMetadata(
-        id="test",
-        source="test",
-        path=test_file_setup,
-        kubeconfig_path=Path("/test/kubeconfig"),
-        initialized=True,
-    )
-    bundle_manager.get_active_bundle.return_value = bundle
+    bundle_manager.get_active_bundle.return_value = normalization_bundle
 
     # Create the explorer
     explorer = FileExplorer(bundle_manager)
@@ -459,6 +485,6 @@ def test_file_explorer_path_normalization(path, expected_traversal, test_file_se
         # Should normalize without error
         normalized = explorer._normalize_path(path)
         assert normalized.is_absolute()
-        assert test_file_setup in normalized.parents or normalized == test_file_setup
+        assert bundle_dir in normalized.parents or normalized == bundle_dir
         # Make sure we're still under the test directory (not elsewhere on disk)
-        assert str(normalized).startswith(str(test_file_setup))
+        assert str(normalized).startswith(str(bundle_dir))
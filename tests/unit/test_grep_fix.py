@@ -1,9 +1,7 @@
-#!/usr/bin/env python3
 """
 Test script to verify the grep_files function fix.
 """
 
-import asyncio
 import pytest
 import shutil
 import tempfile
@@ -17,7 +15,7 @@ from mcp_server_troubleshoot.files import FileExplorer
 pytestmark = pytest.mark.unit
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_grep_files_with_kubeconfig():
     """Test the grep_files function with the 'kubeconfig' pattern."""
     # Create a temporary test directory
@@ -108,7 +106,3 @@ async def test_grep_files_with_kubeconfig():
         # Clean up
         shutil.rmtree(temp_dir)
         print(f"Cleaned up test directory: {temp_dir}")
-
-
-if __name__ == "__main__":
-    asyncio.run(test_grep_files_with_kubeconfig())
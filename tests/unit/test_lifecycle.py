@@ -17,10 +17,26 @@ from mcp_server_troubleshoot.lifecycle import (
     create_temp_directory,
     handle_signal,
     periodic_bundle_cleanup,
+    setup_event_loop_policy,
     setup_signal_handlers,
 )
 
 
+@pytest.fixture(scope="module")
+def mock_server():
+    """Create a FastMCP stand-in shared by the lifespan tests, which only read use_stdio."""
+    server = MagicMock()
+    server.use_stdio = True
+    return server
+
+
+@pytest.fixture(autouse=True)
+def lifespan_env(monkeypatch):
+    """Clear the lifespan configuration variables so tests start from the defaults."""
+    for name in ("MCP_BUNDLE_STORAGE", "ENABLE_PERIODIC_CLEANUP", "CLEANUP_INTERVAL"):
+        monkeypatch.delenv(name, raising=False)
+
+
 @pytest.fixture
 def temp_bundle_dir():
     """Create a temporary directory for test bundles."""
@@ -33,10 +49,11 @@ def temp_bundle_dir():
 def test_create_temp_directory():
     """Test creating a temporary directory."""
     temp_dir = create_temp_directory()
-    assert os.path.exists(temp_dir)
-    assert "mcp-troubleshoot" in temp_dir
+    assert os.path.exists(temp_dir.name)
+    assert "mcp-troubleshoot" in temp_dir.name
     # Clean up
-    shutil.rmtree(temp_dir, ignore_errors=True)
+    temp_dir.cleanup()
+    assert not os.path.exists(temp_dir.name)
 
 
 @pytest.mark.asyncio
@@ -63,41 +80,54 @@ async def test_periodic_bundle_cleanup():
 
 
 @pytest.mark.asyncio
-async def test_lifecycle_context_normal_exit():
-    """Test the lifecycle context with normal exit."""
-    # Create a mock FastMCP server
-    mock_server = MagicMock()
-    mock_server.use_stdio = True
+async def test_periodic_bundle_cleanup_stop_event():
+    """Test that setting the stop event ends the cleanup task without waiting out the interval."""
+    mock_bundle_manager = AsyncMock()
+    stop_event = asyncio.Event()
 
-    # Set environment variables for the test
-    with patch.dict(os.environ, {"ENABLE_PERIODIC_CLEANUP": "true", "CLEANUP_INTERVAL": "60"}):
-        # Enter the context manager
-        async with app_lifespan(mock_server) as context:
-            # Verify resources were initialized
-            assert context.bundle_manager is not None
-            assert context.file_explorer is not None
-            assert context.kubectl_executor is not None
-            assert os.path.exists(context.temp_dir)
-            assert "mcp-troubleshoot" in context.temp_dir
+    task = asyncio.create_task(
+        periodic_bundle_cleanup(mock_bundle_manager, interval=3600, stop_event=stop_event)
+    )
+    await asyncio.sleep(0)
 
-            # Verify metadata
-            assert "start_time" in context.metadata
-            assert context.metadata["stdio_mode"] is True
+    stop_event.set()
+    await asyncio.wait_for(task, timeout=1)
+
+    # The task finished on its own, before the first cleanup was due
+    assert not task.cancelled()
+    mock_bundle_manager.cleanup.assert_not_awaited()
 
-            # Store temp_dir for verification after exit
-            temp_dir = context.temp_dir
 
-        # After exit, verify the temp directory was removed
-        assert not os.path.exists(temp_dir)
+@pytest.mark.asyncio
+async def test_lifecycle_context_normal_exit(mock_server, monkeypatch):
+    """Test the lifecycle context with normal exit."""
+    # Set environment variables for the test
+    monkeypatch.setenv("ENABLE_PERIODIC_CLEANUP", "true")
+    monkeypatch.setenv("CLEANUP_INTERVAL", "60")
+
+    # Enter the context manager
+    async with app_lifespan(mock_server) as context:
+        # Verify resources were initialized
+        assert context.bundle_manager is not None
+        assert context.file_explorer is not None
+        assert context.kubectl_executor is not None
+        assert os.path.exists(context.temp_dir)
+        assert "mcp-troubleshoot" in context.temp_dir
+
+        # Verify metadata
+        assert "start_time" in context.metadata
+        assert context.metadata["stdio_mode"] is True
+
+        # Store temp_dir for verification after exit
+        temp_dir = context.temp_dir
+
+    # After exit, verify the temp directory was removed
+    assert not os.path.exists(temp_dir)
 
 
 @pytest.mark.asyncio
-async def test_lifecycle_context_with_exception():
+async def test_lifecycle_context_with_exception(mock_server):
     """Test the lifecycle context when an exception occurs during execution."""
-    # Create a mock FastMCP server
-    mock_server = MagicMock()
-    mock_server.use_stdio = True
-
     temp_dir = None
 
     # Enter the context manager but raise an exception inside
@@ -117,34 +147,57 @@ async def test_lifecycle_context_with_exception():
     assert not os.path.exists(temp_dir)
 
 
-def test_background_tasks_cleanup():
-    """Test that background tasks are properly cancelled during shutdown."""
-    # We'll use a simplified approach and just verify the structure of the code
+@pytest.mark.asyncio
+async def test_background_tasks_cleanup(mock_server, monkeypatch):
+    """Test that background tasks are stopped and awaited during shutdown."""
+    monkeypatch.setenv("ENABLE_PERIODIC_CLEANUP", "true")
+
+    async with app_lifespan(mock_server) as context:
+        tasks = list(context.background_tasks.values())
+        assert tasks
+        assert not any(task.done() for task in tasks)
+
+    # The stop event ends the tasks without cancelling them
+    assert all(task.done() and not task.cancelled() for task in tasks)
 
-    # Create mock server and task
-    mock_server = MagicMock()
-    mock_server.use_stdio = True
 
-    mock_task = MagicMock()
-    mock_task.done.return_value = False
+@pytest.mark.asyncio
+async def test_background_task_cancelled_after_timeout(mock_server, monkeypatch):
+    """Test that a background task ignoring the stop event is cancelled after the timeout."""
+    real_wait = asyncio.wait
+
+    async def short_wait(tasks, timeout=None):
+        return await real_wait(tasks, timeout=0.01 if timeout else None)
 
-    # The test just verifies that the lifecycle cleanup code calls cancel on tasks
-    # that are not done. We'll manually simulate this by extracting the relevant
-    # code from the app_lifespan function
+    monkeypatch.setattr("mcp_server_troubleshoot.lifecycle.asyncio.wait", short_wait)
 
-    mock_task.cancel()
+    async with app_lifespan(mock_server) as context:
+        task = asyncio.create_task(asyncio.sleep(3600))
+        context.background_tasks["stuck"] = task
 
-    # If we got here without an exception, the test passes
-    assert True
+    assert task.cancelled()
 
 
 @pytest.mark.asyncio
-async def test_bundle_manager_cleanup_called():
-    """Test that bundle manager cleanup is called during shutdown."""
-    # Create a mock FastMCP server
-    mock_server = MagicMock()
-    mock_server.use_stdio = True
+async def test_background_task_failure_is_logged(mock_server):
+    """Test that a failed background task is logged without breaking shutdown."""
 
+    async def fail():
+        raise RuntimeError("task failed")
+
+    with patch("mcp_server_troubleshoot.lifecycle.logger") as mock_logger:
+        async with app_lifespan(mock_server) as context:
+            context.background_tasks["failing"] = asyncio.create_task(fail())
+            temp_dir = context.temp_dir
+            await asyncio.sleep(0)
+
+    mock_logger.error.assert_called_once_with("Background task failing failed: task failed")
+    assert not os.path.exists(temp_dir)
+
+
+@pytest.mark.asyncio
+async def test_bundle_manager_cleanup_called(mock_server):
+    """Test that bundle manager cleanup is called during shutdown."""
     # Create a test context with a mock bundle manager from the start
     with patch("mcp_server_troubleshoot.lifecycle.BundleManager") as BundleManagerMock:
         # Create a mock bundle manager instance
@@ -160,12 +213,8 @@ async def test_bundle_manager_cleanup_called():
 
 
 @pytest.mark.asyncio
-async def test_temp_dir_cleanup_error_handling():
+async def test_temp_dir_cleanup_error_handling(mock_server):
     """Test handling of errors during temp directory cleanup."""
-    # Create a mock FastMCP server
-    mock_server = MagicMock()
-    mock_server.use_stdio = True
-
     # Patch rmtree to raise an exception during cleanup
     with patch("shutil.rmtree", side_effect=OSError("Test cleanup error")):
         # Enter the context manager
@@ -204,3 +253,25 @@ def test_setup_signal_handlers():
             signals = [args[0] for args in calls]
             assert signal.SIGTERM in signals
             assert signal.SIGINT in signals
+
+
+def test_setup_event_loop_policy_uses_uvloop():
+    """Test that the uvloop policy is installed when uvloop is importable."""
+    fake_uvloop = MagicMock()
+    with patch.dict(os.environ, {}, clear=True):
+        with patch.dict("sys.modules", {"uvloop": fake_uvloop}):
+            with patch("asyncio.set_event_loop_policy") as mock_set_policy:
+                setup_event_loop_policy()
+
+    mock_set_policy.assert_called_once_with(fake_uvloop.EventLoopPolicy.return_value)
+
+
+def test_setup_event_loop_policy_without_uvloop():
+    """Test that the default policy is kept when uvloop is not installed."""
+    with patch.dict(os.environ, {}, clear=True):
+        # A None entry makes the import raise ImportError
+        with patch.dict("sys.modules", {"uvloop": None}):
+            with patch("asyncio.set_event_loop_policy") as mock_set_policy:
+                setup_event_loop_policy()
+
+    mock_set_policy.assert_not_called()
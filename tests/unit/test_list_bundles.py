@@ -2,6 +2,9 @@
 Tests for the list_available_bundles method in BundleManager.
 """
 
+import io
+import os
+import shutil
 import tarfile
 import tempfile
 from pathlib import Path
@@ -11,40 +14,69 @@ import pytest
 from mcp_server_troubleshoot.bundle import BundleManager
 
 
+def _bundle_bytes(members, format=tarfile.DEFAULT_FORMAT):
+    """
+    Build the bytes of a tar.gz archive with the given members.
+
+    The bundle checks need real gzip data, but not good compression, so the
+    fastest compression level is used.
+
+    Args:
+        members: Sequence of (name, data) tuples, in archive order
+        format: The tar format to write
+
+    Returns:
+        The compressed archive
+    """
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz", format=format, compresslevel=1) as tar:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _write_bundle(path, members):
+    """
+    Write a tar.gz archive with the given members, using GNU long-name headers.
+
+    Args:
+        path: Where to write the archive
+        members: Sequence of (name, data) tuples, in archive order
+    """
+    path.write_bytes(_bundle_bytes(members, format=tarfile.GNU_FORMAT))
+
+
+# Mock bundles are compressed once at import; fixtures only write the bytes.
+# The valid bundle has the expected cluster-resources structure, the invalid
+# one only a stray file.
+VALID_BUNDLE_BYTES = _bundle_bytes([("support-bundle-2023/cluster-resources/pods.json", b"")])
+INVALID_BUNDLE_BYTES = _bundle_bytes([("some_file.txt", b"")])
+
+
 @pytest.fixture
 def temp_bundle_dir():
     """Create a temporary directory for test bundles."""
     temp_dir = tempfile.mkdtemp(prefix="test_bundle_dir_")
     yield Path(temp_dir)
-    # Cleanup
-    import shutil
-
-    shutil.rmtree(temp_dir)
+    # Cleanup; initialized bundles may leave extracted files behind
+    shutil.rmtree(temp_dir, ignore_errors=True)
 
 
 @pytest.fixture
 def mock_valid_bundle(temp_bundle_dir):
     """Create a mock valid support bundle file."""
-    # Create a tar.gz file with the expected structure
     bundle_path = temp_bundle_dir / "valid_bundle.tar.gz"
-    with tarfile.open(bundle_path, "w:gz") as tar:
-        # Add a cluster-resources directory
-        info = tarfile.TarInfo("support-bundle-2023/cluster-resources/pods.json")
-        info.size = 0
-        tar.addfile(info)
+    bundle_path.write_bytes(VALID_BUNDLE_BYTES)
     return bundle_path
 
 
 @pytest.fixture
 def mock_invalid_bundle(temp_bundle_dir):
     """Create a mock invalid bundle file."""
-    # Create a tar.gz file without the expected structure
     bundle_path = temp_bundle_dir / "invalid_bundle.tar.gz"
-    with tarfile.open(bundle_path, "w:gz") as tar:
-        # Add a file but not the expected structure
-        info = tarfile.TarInfo("some_file.txt")
-        info.size = 0
-        tar.addfile(info)
+    bundle_path.write_bytes(INVALID_BUNDLE_BYTES)
     return bundle_path
 
 
@@ -123,6 +155,23 @@ async def test_list_available_bundles_mixed(
     assert sorted_bundles[1].name == "valid_bundle.tar.gz"
 
 
+@pytest.mark.asyncio
+async def test_iter_available_bundles_newest_first(temp_bundle_dir):
+    """Test that bundles are yielded newest first and iteration can stop early."""
+    for age, name in enumerate(("newest.tar.gz", "middle.tar.gz", "oldest.tar.gz")):
+        bundle_path = temp_bundle_dir / name
+        bundle_path.write_bytes(VALID_BUNDLE_BYTES)
+        os.utime(bundle_path, (1_000_000 - age, 1_000_000 - age))
+
+    bundle_manager = BundleManager(temp_bundle_dir)
+    names = [bundle.name async for bundle in bundle_manager.iter_available_bundles()]
+    assert names == ["newest.tar.gz", "middle.tar.gz", "oldest.tar.gz"]
+
+    async for bundle in bundle_manager.iter_available_bundles():
+        assert bundle.name == "newest.tar.gz"
+        break
+
+
 @pytest.mark.asyncio
 async def test_list_available_bundles_non_existing_dir(temp_bundle_dir):
     """Test listing bundles with a non-existing directory."""
@@ -172,7 +221,6 @@ async def test_relative_path_initialization(temp_bundle_dir, mock_valid_bundle):
     3. Successfully initializing the bundle with the relative path
     """
     import logging
-    import os
     from unittest.mock import patch
 
     logger = logging.getLogger(__name__)
@@ -232,7 +280,6 @@ async def test_bundle_path_resolution_behavior(temp_bundle_dir, mock_valid_bundl
     2. Relative paths are resolved within the bundle directory
     3. Filenames are found within the bundle directory
     """
-    import os
     from unittest.mock import patch
 
     # Create the bundle manager
@@ -260,9 +307,10 @@ async def test_bundle_path_resolution_behavior(temp_bundle_dir, mock_valid_bundl
         subdir = temp_bundle_dir / "subdir"
         os.makedirs(subdir, exist_ok=True)
         rel_bundle = subdir / "subdir_bundle.tar.gz"
-        import shutil
-
-        shutil.copy(mock_valid_bundle, rel_bundle)
+        try:
+            os.link(mock_valid_bundle, rel_bundle)
+        except OSError:
+            shutil.copy(mock_valid_bundle, rel_bundle)
 
         # Now try to initialize with a relative path from the bundle_dir
         rel_path = "subdir/subdir_bundle.tar.gz"
@@ -273,3 +321,121 @@ async def test_bundle_path_resolution_behavior(temp_bundle_dir, mock_valid_bundl
         # Test 3: Just filename - should be found within bundle directory
         metadata = await bundle_manager.initialize_bundle("valid_bundle.tar.gz")
         assert metadata.source == "valid_bundle.tar.gz"
+
+
+def test_bundle_validity_checker_skips_member_data(temp_bundle_dir):
+    """Test that the support bundle marker is found after members with data."""
+    bundle_path = temp_bundle_dir / "data_first.tar.gz"
+    _write_bundle(
+        bundle_path,
+        [("version.yaml", b"x" * 1000), ("bundle/cluster-resources/pods.json", b"[]")],
+    )
+
+    bundle_manager = BundleManager(temp_bundle_dir)
+    assert bundle_manager._check_bundle_validity(bundle_path) == (True, None)
+
+
+def test_bundle_validity_checker_long_member_names(temp_bundle_dir):
+    """Test that members whose names need a GNU long-name header are still read."""
+    bundle_path = temp_bundle_dir / "long_names.tar.gz"
+    _write_bundle(bundle_path, [("bundle/" + "d" * 120 + "/cluster-resources/pods.json", b"[]")])
+
+    bundle_manager = BundleManager(temp_bundle_dir)
+    assert bundle_manager._check_bundle_validity(bundle_path) == (True, None)
+
+
+def test_bundle_validity_checker_gzip_without_tar(temp_bundle_dir):
+    """Test that a gzip file that does not hold a tar archive is rejected."""
+    import gzip
+
+    bundle_path = temp_bundle_dir / "plain.tar.gz"
+    bundle_path.write_bytes(gzip.compress(b"not a tar archive" * 100))
+
+    bundle_manager = BundleManager(temp_bundle_dir)
+    valid, message = bundle_manager._check_bundle_validity(bundle_path)
+    assert valid is False
+    assert message.startswith("Not a valid tar.gz file")
+
+
+def test_bundle_validity_checker_too_small(temp_bundle_dir, monkeypatch):
+    """Test that files too small to be a bundle are rejected without opening them."""
+    bundle_path = temp_bundle_dir / "tiny.tar.gz"
+    bundle_path.write_bytes(b"\x1f\x8b" + b"\0" * 8)
+
+    bundle_manager = BundleManager(temp_bundle_dir)
+    monkeypatch.setattr(
+        bundle_manager, "_probe_bundle_archive", lambda _: pytest.fail("archive was opened")
+    )
+    assert bundle_manager._check_bundle_validity(bundle_path) == (
+        False,
+        "File too small to be a bundle",
+    )
+
+
+def test_bundle_validity_checker_caches_results(temp_bundle_dir, mock_valid_bundle, monkeypatch):
+    """Test that validity results are reused until the bundle file changes."""
+    bundle_manager = BundleManager(temp_bundle_dir)
+    probes = []
+    probe = bundle_manager._probe_bundle_archive
+
+    def recording_probe(file_path):
+        probes.append(file_path)
+        return probe(file_path)
+
+    monkeypatch.setattr(bundle_manager, "_probe_bundle_archive", recording_probe)
+
+    assert bundle_manager._check_bundle_validity(mock_valid_bundle) == (True, None)
+    assert bundle_manager._check_bundle_validity(mock_valid_bundle) == (True, None)
+    assert probes == [mock_valid_bundle]
+
+    # Replacing the file changes its size, so the bundle is probed again
+    mock_valid_bundle.write_bytes(b"not a bundle" * 10)
+    valid, message = bundle_manager._check_bundle_validity(mock_valid_bundle)
+    assert valid is False
+    assert message is not None
+    assert probes == [mock_valid_bundle, mock_valid_bundle]
+
+
+@pytest.mark.asyncio
+async def test_list_available_bundles_dir_removed(temp_bundle_dir):
+    """Test listing bundles when the bundle directory disappears after setup."""
+    bundle_dir = temp_bundle_dir / "removed"
+    bundle_manager = BundleManager(bundle_dir)
+    bundle_dir.rmdir()
+
+    assert await bundle_manager.list_available_bundles(include_invalid=True) == []
+
+
+@pytest.mark.asyncio
+async def test_list_available_bundles_dir_not_a_directory(temp_bundle_dir):
+    """Test listing bundles when the bundle directory path is a regular file."""
+    bundle_dir = temp_bundle_dir / "not_a_dir"
+    bundle_manager = BundleManager(bundle_dir)
+    bundle_dir.rmdir()
+    bundle_dir.write_text("not a directory")
+
+    assert await bundle_manager.list_available_bundles(include_invalid=True) == []
+
+
+@pytest.mark.asyncio
+async def test_list_available_bundles_skips_directories(temp_bundle_dir, mock_valid_bundle):
+    """Test that directories with a bundle extension are not listed."""
+    (temp_bundle_dir / "extracted.tar.gz").mkdir()
+    bundle_manager = BundleManager(temp_bundle_dir)
+
+    bundles = await bundle_manager.list_available_bundles(include_invalid=True)
+    assert [bundle.name for bundle in bundles] == ["valid_bundle.tar.gz"]
+
+
+def test_bundle_validity_checker_long_member_names_bounded(temp_bundle_dir):
+    """Test that the tarfile fallback only inspects the first members of the archive."""
+    bundle_path = temp_bundle_dir / "late_marker.tar.gz"
+    long_dir = "bundle/" + "d" * 120
+    members = [(f"{long_dir}/file-{i}.txt", b"") for i in range(20)]
+    members.append((f"{long_dir}/cluster-resources/pods.json", b"[]"))
+    _write_bundle(bundle_path, members)
+
+    bundle_manager = BundleManager(temp_bundle_dir)
+    valid, message = bundle_manager._check_bundle_validity(bundle_path)
+    assert valid is False
+    assert "expected support bundle structure" in message
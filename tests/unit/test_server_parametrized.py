@@ -22,21 +22,33 @@ actual outputs users would see rather than implementation details, which
 makes the tests more resilient to internal refactoring.
 """
 
-import tempfile
-from unittest.mock import AsyncMock, Mock, patch
+import signal
+from dataclasses import dataclass
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, create_autospec
 
 import pytest
 
-from mcp_server_troubleshoot.bundle import BundleManagerError
+import mcp_server_troubleshoot.server as srv
+from mcp_server_troubleshoot.bundle import (
+    BundleManagerError,
+    InitializeBundleArgs,
+    ListAvailableBundlesArgs,
+)
 from mcp_server_troubleshoot.files import (
     FileContentResult,
+    FileExplorer,
     FileInfo,
     FileListResult,
+    GrepFilesArgs,
     GrepMatch,
     GrepResult,
     FileSystemError,
+    ListFilesArgs,
     PathNotFoundError,
+    ReadFileArgs,
 )
+from mcp_server_troubleshoot.kubectl import KubectlCommandArgs, KubectlError
 from mcp_server_troubleshoot.server import (
     initialize_bundle,
     kubectl,
@@ -52,8 +64,147 @@ from mcp_server_troubleshoot.server import (
 # Mark all tests in this file as unit tests and quick tests
 pytestmark = [pytest.mark.unit, pytest.mark.quick]
 
+# Explorer results returned by the mocked file operations
+_LIST_RESULT = FileListResult(
+    path="dir1",
+    entries=[
+        FileInfo(
+            name="file1.txt",
+            path="dir1/file1.txt",
+            type="file",
+            size=100,
+            access_time=123456789.0,
+            modify_time=123456789.0,
+            is_binary=False,
+        )
+    ],
+    recursive=False,
+    total_files=1,
+    total_dirs=0,
+)
 
-@pytest.mark.asyncio
+_READ_RESULT = FileContentResult(
+    path="dir1/file1.txt",
+    content="This is the file content",
+    start_line=0,
+    end_line=0,
+    total_lines=1,
+    binary=False,
+)
+
+_GREP_RESULT = GrepResult(
+    pattern="pattern",
+    path="dir1",
+    glob_pattern="*.txt",
+    matches=[
+        GrepMatch(
+            path="dir1/file1.txt",
+            line_number=0,
+            line="This contains pattern",
+            match="pattern",
+            offset=13,
+        )
+    ],
+    total_matches=1,
+    files_searched=1,
+    case_sensitive=False,
+    truncated=False,
+)
+
+_GREP_MULTIPLE_RESULT = GrepResult(
+    pattern="common",
+    path=".",
+    glob_pattern="*.txt",
+    matches=[
+        GrepMatch(
+            path="dir1/file1.txt",
+            line_number=0,
+            line="This has common text",
+            match="common",
+            offset=9,
+        ),
+        GrepMatch(
+            path="dir2/file2.txt",
+            line_number=1,
+            line="More common text",
+            match="common",
+            offset=5,
+        ),
+    ],
+    total_matches=2,
+    files_searched=3,
+    case_sensitive=False,
+    truncated=False,
+)
+
+
+# Per file operation: args model, FileExplorer method, server tool, and the
+# positional arguments the tool passes on to the explorer
+_OPS = {
+    "list_files": (ListFilesArgs, "list_files", list_files, lambda a: (a["path"], a["recursive"])),
+    "read_file": (
+        ReadFileArgs,
+        "read_file",
+        read_file,
+        lambda a: (a["path"], a["start_line"], a["end_line"]),
+    ),
+    "grep_files": (
+        GrepFilesArgs,
+        "grep_files",
+        grep_files,
+        lambda a: (
+            a["pattern"],
+            a["path"],
+            a["recursive"],
+            a["glob_pattern"],
+            a["case_sensitive"],
+            a["max_results"],
+        ),
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def autospec_explorer():
+    """
+    Provides a FileExplorer autospec shared by the tests of this module.
+
+    Building the spec introspects FileExplorer, so it is done once; wire_server
+    resets the configured results and errors after each test.
+
+    Returns:
+        Mock FileExplorer instance whose methods check their call signatures
+    """
+    return create_autospec(FileExplorer, instance=True)
+
+
+@pytest.fixture
+def wire_server(monkeypatch, autospec_explorer):
+    """
+    Route the server's component getters to fresh mocks.
+
+    The getters look the mocks up on each call, so tests may also replace them.
+    The explorer is the shared autospec, so tests configure its methods rather
+    than assigning new ones.
+
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+        autospec_explorer: Shared FileExplorer autospec
+
+    Yields:
+        Namespace with the manager, executor and explorer mocks
+    """
+    mocks = SimpleNamespace(manager=Mock(), executor=Mock(), explorer=autospec_explorer)
+    monkeypatch.setattr("mcp_server_troubleshoot.server.get_bundle_manager", lambda: mocks.manager)
+    monkeypatch.setattr(
+        "mcp_server_troubleshoot.server.get_kubectl_executor", lambda: mocks.executor
+    )
+    monkeypatch.setattr("mcp_server_troubleshoot.server.get_file_explorer", lambda: mocks.explorer)
+    yield mocks
+    autospec_explorer.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.mark.asyncio(loop_scope="module")
 @pytest.mark.parametrize(
     "source,force,api_available,expected_strings",
     [
@@ -76,7 +227,15 @@ pytestmark = [pytest.mark.unit, pytest.mark.quick]
     ],
 )
 async def test_initialize_bundle_tool_parametrized(
-    source, force, api_available, expected_strings, test_assertions, test_factory
+    source,
+    force,
+    api_available,
+    expected_strings,
+    dummy_source_path,
+    mock_metadata,
+    wire_server,
+    test_assertions,
+    test_factory,
 ):
     """
     Test the initialize_bundle tool with different inputs.
@@ -86,46 +245,37 @@ async def test_initialize_bundle_tool_parametrized(
         force: Whether to force initialization
         api_available: Whether the API server is available
         expected_strings: Strings expected in the response
+        dummy_source_path: Existing bundle file shared by all cases
+        mock_metadata: Metadata of the bundle initialized from dummy_source_path
+        wire_server: Mocks behind the server's component getters
         test_assertions: Assertions helper fixture
         test_factory: Factory for test objects
     """
-    # Create a test file that exists
-    with tempfile.NamedTemporaryFile() as temp_file:
-        # Create a mock metadata object
-        mock_metadata = test_factory.create_bundle_metadata(
-            id="test_bundle",
-            source=temp_file.name,
-        )
+    assert mock_metadata.source == dummy_source_path
 
-        # Create a mock for the bundle manager
-        with patch("mcp_server_troubleshoot.server.get_bundle_manager") as mock_get_manager:
-            mock_manager = Mock()
-            mock_manager._check_sbctl_available = AsyncMock(return_value=True)
-            mock_manager.initialize_bundle = AsyncMock(return_value=mock_metadata)
-            mock_manager.check_api_server_available = AsyncMock(return_value=api_available)
-            mock_manager.get_diagnostic_info = AsyncMock(return_value={})
-            mock_get_manager.return_value = mock_manager
-
-            # Create InitializeBundleArgs instance
-            from mcp_server_troubleshoot.bundle import InitializeBundleArgs
+    # Create a mock for the bundle manager
+    mock_manager = wire_server.manager = test_factory.create_bundle_manager_mock(
+        metadata=mock_metadata, api_available=api_available
+    )
 
-            args = InitializeBundleArgs(source=temp_file.name, force=force)
+    # Create InitializeBundleArgs instance
+    args = InitializeBundleArgs(source=dummy_source_path, force=force)
 
-            # Call the tool function
-            response = await initialize_bundle(args)
+    # Call the tool function
+    response = await initialize_bundle(args)
 
-            # Verify method calls
-            mock_manager._check_sbctl_available.assert_awaited_once()
-            mock_manager.initialize_bundle.assert_awaited_once_with(temp_file.name, force)
-            mock_manager.check_api_server_available.assert_awaited_once()
+    # Verify method calls
+    mock_manager._check_sbctl_available.assert_awaited_once()
+    mock_manager.initialize_bundle.assert_awaited_once_with(dummy_source_path, force)
+    mock_manager.check_api_server_available.assert_awaited_once()
 
-            # Use the test assertion helper to verify response
-            test_assertions.assert_api_response_valid(response, "text", expected_strings)
+    # Use the test assertion helper to verify response
+    test_assertions.assert_api_response_valid(response, "text", expected_strings)
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 @pytest.mark.parametrize(
-    "command,timeout,json_output,result_exit_code,result_stdout,expected_strings",
+    "command,timeout,json_output,result_exit_code,result_stdout,error,expected_strings",
     [
         # Success case - JSON output
         (
@@ -134,6 +284,7 @@ async def test_initialize_bundle_tool_parametrized(
             True,
             0,
             '{"items": []}',
+            None,
             ["kubectl command executed successfully", "items", "Command metadata"],
         ),
         # Success case - text output
@@ -143,10 +294,19 @@ async def test_initialize_bundle_tool_parametrized(
             False,
             0,
             "NAME  READY  STATUS",
+            None,
             ["kubectl command executed successfully", "NAME  READY  STATUS"],
         ),
         # Error case - command failed
-        ("get invalid", 30, True, 1, "", ["kubectl command failed", "exit code 1"]),
+        (
+            "get invalid",
+            30,
+            True,
+            1,
+            "",
+            KubectlError("kubectl command failed: get invalid", 1, ""),
+            ["kubectl command failed", "exit code 1"],
+        ),
     ],
     ids=[
         "success-json",
@@ -160,7 +320,10 @@ async def test_kubectl_tool_parametrized(
     json_output,
     result_exit_code,
     result_stdout,
+    error,
     expected_strings,
+    bundle,
+    wire_server,
     test_assertions,
     test_factory,
 ):
@@ -173,79 +336,54 @@ async def test_kubectl_tool_parametrized(
         json_output: Whether to use JSON output
         result_exit_code: Mock result exit code
         result_stdout: Mock result stdout
+        error: Error raised by the executor instead of returning a result
         expected_strings: Strings expected in the response
+        bundle: Active bundle shared by all cases
+        wire_server: Mocks behind the server's component getters
         test_assertions: Assertions helper fixture
         test_factory: Factory for test objects
     """
-    # Create a mock result
-    mock_result = test_factory.create_kubectl_result(
-        command=command,
-        exit_code=result_exit_code,
-        stdout=result_stdout,
-        stderr="",
-        is_json=json_output and result_exit_code == 0,  # Only JSON for success cases
-        duration_ms=100,
+    # Set up the mocks
+    # The shared test bundle is NOT host-only
+    mock_manager = wire_server.manager = test_factory.create_bundle_manager_mock(
+        active_bundle=bundle
     )
 
-    # Set up the mocks
-    with patch("mcp_server_troubleshoot.server.get_bundle_manager") as mock_get_manager:
-        mock_manager = Mock()
-        # Mock an active bundle that's NOT host-only
-        from mcp_server_troubleshoot.bundle import BundleMetadata
-        from pathlib import Path
-
-        mock_bundle = BundleMetadata(
-            id="test",
-            source="test",
-            path=Path("/test"),
-            kubeconfig_path=Path("/test/kubeconfig"),
-            initialized=True,
-            host_only_bundle=False,  # Not a host-only bundle
+    mock_executor = wire_server.executor
+
+    # For error cases, raise the prebuilt exception
+    if error is not None:
+        mock_executor.execute = AsyncMock(side_effect=error)
+    else:
+        # For success cases, return a mock result
+        mock_result = test_factory.create_kubectl_result(
+            command=command,
+            exit_code=result_exit_code,
+            stdout=result_stdout,
+            stderr="",
+            is_json=json_output,
+            duration_ms=100,
         )
-        mock_manager.get_active_bundle = Mock(return_value=mock_bundle)
-        mock_manager.check_api_server_available = AsyncMock(return_value=True)
-        # Add diagnostic info mock to avoid diagnostics error
-        mock_manager.get_diagnostic_info = AsyncMock(return_value={"api_server_available": True})
-        mock_get_manager.return_value = mock_manager
-
-        with patch("mcp_server_troubleshoot.server.get_kubectl_executor") as mock_get_executor:
-            mock_executor = Mock()
-
-            # For error cases, raise an exception
-            if result_exit_code != 0:
-                from mcp_server_troubleshoot.kubectl import KubectlError
-
-                mock_executor.execute = AsyncMock(
-                    side_effect=KubectlError(
-                        f"kubectl command failed: {command}", result_exit_code, ""
-                    )
-                )
-            else:
-                # For success cases, return the mock result
-                mock_executor.execute = AsyncMock(return_value=mock_result)
-
-            mock_get_executor.return_value = mock_executor
-
-            # Create KubectlCommandArgs instance
-            from mcp_server_troubleshoot.kubectl import KubectlCommandArgs
+        mock_executor.execute = AsyncMock(return_value=mock_result)
 
-            args = KubectlCommandArgs(command=command, timeout=timeout, json_output=json_output)
+    # Create KubectlCommandArgs instance
+    args = KubectlCommandArgs(command=command, timeout=timeout, json_output=json_output)
 
-            # Call the tool function
-            response = await kubectl(args)
+    # Call the tool function
+    response = await kubectl(args)
 
-            # Verify API check called
-            mock_manager.check_api_server_available.assert_awaited_once()
+    # Verify API check called
+    mock_manager.check_api_server_available.assert_awaited_once()
 
-            # For success cases, verify kubectl execution
-            if result_exit_code == 0:
-                mock_executor.execute.assert_awaited_once_with(command, timeout, json_output)
+    # For success cases, verify kubectl execution
+    if error is None:
+        mock_executor.execute.assert_awaited_once_with(command, timeout, json_output)
 
-            # Use the test assertion helper to verify response
-            test_assertions.assert_api_response_valid(response, "text", expected_strings)
+    # Use the test assertion helper to verify response
+    test_assertions.assert_api_response_valid(response, "text", expected_strings)
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 @pytest.mark.parametrize(
     "file_operation,args,result,expected_strings",
     [
@@ -253,37 +391,14 @@ async def test_kubectl_tool_parametrized(
         (
             "list_files",
             {"path": "dir1", "recursive": False},
-            FileListResult(
-                path="dir1",
-                entries=[
-                    FileInfo(
-                        name="file1.txt",
-                        path="dir1/file1.txt",
-                        type="file",
-                        size=100,
-                        access_time=123456789.0,
-                        modify_time=123456789.0,
-                        is_binary=False,
-                    )
-                ],
-                recursive=False,
-                total_files=1,
-                total_dirs=0,
-            ),
+            _LIST_RESULT,
             ["Listed files", "file1.txt", "total_files", "total_dirs"],
         ),
         # Test 2: read_file
         (
             "read_file",
             {"path": "dir1/file1.txt", "start_line": 0, "end_line": 0},
-            FileContentResult(
-                path="dir1/file1.txt",
-                content="This is the file content",
-                start_line=0,
-                end_line=0,
-                total_lines=1,
-                binary=False,
-            ),
+            _READ_RESULT,
             ["Read text file", "This is the file content"],
         ),
         # Test 3: grep_files
@@ -297,24 +412,7 @@ async def test_kubectl_tool_parametrized(
                 "case_sensitive": False,
                 "max_results": 100,
             },
-            GrepResult(
-                pattern="pattern",
-                path="dir1",
-                glob_pattern="*.txt",
-                matches=[
-                    GrepMatch(
-                        path="dir1/file1.txt",
-                        line_number=0,
-                        line="This contains pattern",
-                        match="pattern",
-                        offset=13,
-                    )
-                ],
-                total_matches=1,
-                files_searched=1,
-                case_sensitive=False,
-                truncated=False,
-            ),
+            _GREP_RESULT,
             ["Found 1 matches", "This contains pattern", "total_matches"],
         ),
         # Test 4: grep_files (multiple matches)
@@ -328,31 +426,7 @@ async def test_kubectl_tool_parametrized(
                 "case_sensitive": False,
                 "max_results": 100,
             },
-            GrepResult(
-                pattern="common",
-                path=".",
-                glob_pattern="*.txt",
-                matches=[
-                    GrepMatch(
-                        path="dir1/file1.txt",
-                        line_number=0,
-                        line="This has common text",
-                        match="common",
-                        offset=9,
-                    ),
-                    GrepMatch(
-                        path="dir2/file2.txt",
-                        line_number=1,
-                        line="More common text",
-                        match="common",
-                        offset=5,
-                    ),
-                ],
-                total_matches=2,
-                files_searched=3,
-                case_sensitive=False,
-                truncated=False,
-            ),
+            _GREP_MULTIPLE_RESULT,
             ["Found 2 matches", "This has common text", "More common text"],
         ),
     ],
@@ -364,7 +438,7 @@ async def test_kubectl_tool_parametrized(
     ],
 )
 async def test_file_operations_parametrized(
-    file_operation, args, result, expected_strings, test_assertions
+    file_operation, args, result, expected_strings, wire_server, test_assertions
 ):
     """
     Test file operation tools with different inputs and expected results.
@@ -374,52 +448,24 @@ async def test_file_operations_parametrized(
         args: Arguments for the operation
         result: Mock result to return
         expected_strings: Strings expected in the response
+        wire_server: Mocks behind the server's component getters
         test_assertions: Assertions helper fixture
     """
+    args_cls, method, tool, positional = _OPS[file_operation]
+
     # Set up mock for FileExplorer
-    with patch("mcp_server_troubleshoot.server.get_file_explorer") as mock_get_explorer:
-        mock_explorer = Mock()
-        mock_get_explorer.return_value = mock_explorer
-
-        # Set up the mock result based on the operation
-        if file_operation == "list_files":
-            mock_explorer.list_files = AsyncMock(return_value=result)
-            from mcp_server_troubleshoot.files import ListFilesArgs
-
-            operation_args = ListFilesArgs(**args)
-            response = await list_files(operation_args)
-            mock_explorer.list_files.assert_awaited_once_with(args["path"], args["recursive"])
-
-        elif file_operation == "read_file":
-            mock_explorer.read_file = AsyncMock(return_value=result)
-            from mcp_server_troubleshoot.files import ReadFileArgs
-
-            operation_args = ReadFileArgs(**args)
-            response = await read_file(operation_args)
-            mock_explorer.read_file.assert_awaited_once_with(
-                args["path"], args["start_line"], args["end_line"]
-            )
+    explorer_method = getattr(wire_server.explorer, method)
+    explorer_method.return_value = result
 
-        elif file_operation == "grep_files":
-            mock_explorer.grep_files = AsyncMock(return_value=result)
-            from mcp_server_troubleshoot.files import GrepFilesArgs
-
-            operation_args = GrepFilesArgs(**args)
-            response = await grep_files(operation_args)
-            mock_explorer.grep_files.assert_awaited_once_with(
-                args["pattern"],
-                args["path"],
-                args["recursive"],
-                args["glob_pattern"],
-                args["case_sensitive"],
-                args["max_results"],
-            )
+    response = await tool(args_cls(**args))
+    explorer_method.assert_awaited_once_with(*positional(args))
 
-        # Use the test assertion helper to verify response
-        test_assertions.assert_api_response_valid(response, "text", expected_strings)
+    # Use the test assertion helper to verify response
+    test_assertions.assert_api_response_valid(response, "text", expected_strings)
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize("operation", ["list", "read", "grep"])
 @pytest.mark.parametrize(
     "error_type,error_message,expected_strings",
     [
@@ -449,45 +495,33 @@ async def test_file_operations_parametrized(
     ],
 )
 async def test_file_operations_error_handling(
-    error_type, error_message, expected_strings, test_assertions
+    operation, error_type, error_message, expected_strings, wire_server, test_assertions
 ):
     """
     Test that file operation tools properly handle various error types.
 
     Args:
+        operation: File operation to test (list, read, grep)
         error_type: Type of error to simulate
         error_message: Error message to include
         expected_strings: Strings expected in the response
+        wire_server: Mocks behind the server's component getters
         test_assertions: Assertions helper fixture
     """
-    # Set up mock for FileExplorer that raises the specified error
-    with patch("mcp_server_troubleshoot.server.get_file_explorer") as mock_get_explorer:
-        mock_explorer = Mock()
-        mock_explorer.list_files = AsyncMock(side_effect=error_type(error_message))
-        mock_explorer.read_file = AsyncMock(side_effect=error_type(error_message))
-        mock_explorer.grep_files = AsyncMock(side_effect=error_type(error_message))
-        mock_get_explorer.return_value = mock_explorer
-
-        # Test all three file operations with the same error
-        from mcp_server_troubleshoot.files import ListFilesArgs, ReadFileArgs, GrepFilesArgs
-
-        # 1. Test list_files
-        list_args = ListFilesArgs(path="test/path")
-        list_response = await list_files(list_args)
-        test_assertions.assert_api_response_valid(list_response, "text", expected_strings)
+    tool, method, operation_args = {
+        "list": (list_files, "list_files", ListFilesArgs(path="test/path")),
+        "read": (read_file, "read_file", ReadFileArgs(path="test/file.txt")),
+        "grep": (grep_files, "grep_files", GrepFilesArgs(pattern="test", path="test/path")),
+    }[operation]
 
-        # 2. Test read_file
-        read_args = ReadFileArgs(path="test/file.txt")
-        read_response = await read_file(read_args)
-        test_assertions.assert_api_response_valid(read_response, "text", expected_strings)
+    # Set up mock for FileExplorer that raises the specified error
+    getattr(wire_server.explorer, method).side_effect = error_type(error_message)
 
-        # 3. Test grep_files
-        grep_args = GrepFilesArgs(pattern="test", path="test/path")
-        grep_response = await grep_files(grep_args)
-        test_assertions.assert_api_response_valid(grep_response, "text", expected_strings)
+    response = await tool(operation_args)
+    test_assertions.assert_api_response_valid(response, "text", expected_strings)
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 @pytest.mark.parametrize(
     "include_invalid,bundles_available,expected_strings",
     [
@@ -505,7 +539,7 @@ async def test_file_operations_error_handling(
     ],
 )
 async def test_list_available_bundles_parametrized(
-    include_invalid, bundles_available, expected_strings, test_assertions, test_factory
+    include_invalid, bundles_available, expected_strings, wire_server, test_assertions
 ):
     """
     Test the list_available_bundles tool with different scenarios.
@@ -514,12 +548,11 @@ async def test_list_available_bundles_parametrized(
         include_invalid: Whether to include invalid bundles
         bundles_available: Whether any bundles are available
         expected_strings: Strings expected in the response
+        wire_server: Mocks behind the server's component getters
         test_assertions: Assertions helper fixture
-        test_factory: Factory for test objects
     """
-    # Set up a custom class for testing
-    from dataclasses import dataclass
 
+    # Set up a custom class for testing
     @dataclass
     class MockAvailableBundle:
         name: str
@@ -531,59 +564,56 @@ async def test_list_available_bundles_parametrized(
         validation_message: str = None
 
     # Set up mock for BundleManager
-    with patch("mcp_server_troubleshoot.server.get_bundle_manager") as mock_get_manager:
-        bundle_manager = Mock()
-        mock_get_manager.return_value = bundle_manager
+    bundle_manager = wire_server.manager
+
+    # Create test bundles
+    if bundles_available:
+        bundles = [
+            MockAvailableBundle(
+                name="support-bundle-1.tar.gz",
+                path="/bundles/support-bundle-1.tar.gz",
+                relative_path="support-bundle-1.tar.gz",
+                size_bytes=1024 * 1024,  # 1 MB
+                modified_time=1617292800.0,  # 2021-04-01
+                valid=True,
+            ),
+        ]
 
-        # Create test bundles
-        if bundles_available:
-            bundles = [
+        # Add an invalid bundle if include_invalid is True
+        if include_invalid:
+            bundles.append(
                 MockAvailableBundle(
-                    name="support-bundle-1.tar.gz",
-                    path="/bundles/support-bundle-1.tar.gz",
-                    relative_path="support-bundle-1.tar.gz",
-                    size_bytes=1024 * 1024,  # 1 MB
-                    modified_time=1617292800.0,  # 2021-04-01
-                    valid=True,
-                ),
-            ]
-
-            # Add an invalid bundle if include_invalid is True
-            if include_invalid:
-                bundles.append(
-                    MockAvailableBundle(
-                        name="invalid-bundle.txt",
-                        path="/bundles/invalid-bundle.txt",
-                        relative_path="invalid-bundle.txt",
-                        size_bytes=512,
-                        modified_time=1617292800.0,
-                        valid=False,
-                        validation_message="Not a valid support bundle format",
-                    )
+                    name="invalid-bundle.txt",
+                    path="/bundles/invalid-bundle.txt",
+                    relative_path="invalid-bundle.txt",
+                    size_bytes=512,
+                    modified_time=1617292800.0,
+                    valid=False,
+                    validation_message="Not a valid support bundle format",
                 )
-        else:
-            bundles = []
-
-        # Set up the mock return value
-        bundle_manager.list_available_bundles = AsyncMock(return_value=bundles)
+            )
+    else:
+        bundles = []
 
-        # Create ListAvailableBundlesArgs instance
-        from mcp_server_troubleshoot.bundle import ListAvailableBundlesArgs
+    # Set up the mock return value
+    bundle_manager.list_available_bundles = AsyncMock(return_value=bundles)
 
-        args = ListAvailableBundlesArgs(include_invalid=include_invalid)
+    # Create ListAvailableBundlesArgs instance
+    args = ListAvailableBundlesArgs(include_invalid=include_invalid)
 
-        # Call the tool function
-        response = await list_available_bundles(args)
+    # Call the tool function
+    response = await list_available_bundles(args)
 
-        # Verify method call
-        bundle_manager.list_available_bundles.assert_awaited_once_with(include_invalid)
+    # Verify method call
+    bundle_manager.list_available_bundles.assert_awaited_once_with(include_invalid)
 
-        # Use the test assertion helper to verify response
-        test_assertions.assert_api_response_valid(response, "text", expected_strings)
+    # Use the test assertion helper to verify response
+    test_assertions.assert_api_response_valid(response, "text", expected_strings)
 
 
-@pytest.mark.asyncio
-async def test_cleanup_resources(test_assertions):
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize("mode", ["app_context", "legacy"])
+async def test_cleanup_resources(mode, monkeypatch):
     """
     Test that the cleanup_resources function properly cleans up bundle manager resources.
 
@@ -593,109 +623,76 @@ async def test_cleanup_resources(test_assertions):
     3. Multiple cleanup calls are handled correctly
 
     Args:
-        test_assertions: Assertions helper fixture
+        mode: Where the bundle manager comes from (app_context or legacy global)
+        monkeypatch: Pytest monkeypatch fixture
     """
-    # Mock both app_context and legacy bundle manager
-    with (
-        patch("mcp_server_troubleshoot.server.get_app_context") as mock_get_context,
-        patch("mcp_server_troubleshoot.server.globals") as mock_globals,
-    ):
-
-        # Reset shutdown flag
-        import mcp_server_troubleshoot.server
-
-        mcp_server_troubleshoot.server._is_shutting_down = False
+    # Reset shutdown flag; monkeypatch restores it afterwards
+    monkeypatch.setattr(srv, "_is_shutting_down", False)
 
-        # Setup app context mode
+    mock_bundle_manager = AsyncMock()
+    mock_bundle_manager.cleanup = AsyncMock()
+    if mode == "app_context":
+        # Setup app context mode, with no legacy bundle manager
         mock_app_context = AsyncMock()
-        mock_app_context.bundle_manager = AsyncMock()
-        mock_app_context.bundle_manager.cleanup = AsyncMock()
-
-        # Set return value for get_app_context
-        mock_get_context.return_value = mock_app_context
-
-        # Mock globals for legacy mode
-        mock_globals.return_value = {
-            "_bundle_manager": None  # Not used in this test since we test app_context mode
-        }
-
-        # Call cleanup_resources
-        await cleanup_resources()
-
-        # Verify cleanup was called on app context bundle manager
-        mock_app_context.bundle_manager.cleanup.assert_awaited_once()
-
-        # Verify shutdown flag was set
-        assert mcp_server_troubleshoot.server._is_shutting_down is True
-
-        # Reset mock
-        mock_app_context.bundle_manager.cleanup.reset_mock()
-
-        # Call cleanup_resources again (should not call cleanup again)
-        await cleanup_resources()
-
-        # Verify cleanup was not called again
-        mock_app_context.bundle_manager.cleanup.assert_not_awaited()
-
-    # Now test legacy mode
-    with (
-        patch("mcp_server_troubleshoot.server.get_app_context") as mock_get_context,
-        patch("mcp_server_troubleshoot.server.globals") as mock_globals,
-    ):
-
-        # Reset shutdown flag
-        mcp_server_troubleshoot.server._is_shutting_down = False
-
+        mock_app_context.bundle_manager = mock_bundle_manager
+        monkeypatch.setattr(srv, "get_app_context", Mock(return_value=mock_app_context))
+        monkeypatch.setattr(srv, "_bundle_manager", None)
+    else:
         # Setup legacy mode (no app context)
-        mock_get_context.return_value = None
+        monkeypatch.setattr(srv, "get_app_context", Mock(return_value=None))
+        monkeypatch.setattr(srv, "_bundle_manager", mock_bundle_manager)
+
+    # Call cleanup_resources
+    await cleanup_resources()
 
-        # Setup legacy bundle manager
-        mock_bundle_manager = AsyncMock()
-        mock_bundle_manager.cleanup = AsyncMock()
+    # Verify cleanup was called on the bundle manager
+    mock_bundle_manager.cleanup.assert_awaited_once()
 
-        # Mock globals for legacy mode
-        mock_globals.return_value = {"_bundle_manager": mock_bundle_manager}
+    # Verify shutdown flag was set
+    assert srv._is_shutting_down is True
 
-        # Call cleanup_resources
-        await cleanup_resources()
+    # Reset mock
+    mock_bundle_manager.cleanup.reset_mock()
 
-        # Verify cleanup was called on legacy bundle manager
-        mock_bundle_manager.cleanup.assert_awaited_once()
+    # Call cleanup_resources again (should not call cleanup again)
+    await cleanup_resources()
 
-        # Verify shutdown flag was set
-        assert mcp_server_troubleshoot.server._is_shutting_down is True
+    # Verify cleanup was not called again
+    mock_bundle_manager.cleanup.assert_not_awaited()
 
 
+# Function-scoped loop, since this test patches the asyncio loop functions
 @pytest.mark.asyncio
-async def test_register_signal_handlers():
+async def test_register_signal_handlers(monkeypatch):
     """
     Test that the register_signal_handlers function properly sets up handlers for signals.
 
     This test verifies:
     1. Signal handlers are registered for SIGINT and SIGTERM
     2. The event loop's add_signal_handler method is called
-    """
-    # Mock the asyncio module
-    with patch("asyncio.get_running_loop") as mock_get_loop:
-        mock_loop = Mock()
-        mock_get_loop.return_value = mock_loop
-        mock_loop.is_closed.return_value = False
-        mock_loop.add_signal_handler = Mock()
 
-        # Call register_signal_handlers
-        register_signal_handlers()
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    # Mock the running event loop
+    mock_loop = Mock()
+    mock_loop.is_closed.return_value = False
+    mock_loop.add_signal_handler = Mock()
+    monkeypatch.setattr(srv.asyncio, "get_running_loop", Mock(return_value=mock_loop))
 
-        # Verify add_signal_handler was called for each signal
-        import signal
+    # Call register_signal_handlers
+    register_signal_handlers()
 
-        if hasattr(signal, "SIGTERM"):  # Check for POSIX signals
-            assert mock_loop.add_signal_handler.call_count >= 1
-        else:  # Windows
-            mock_loop.add_signal_handler.assert_called_once()
+    # Verify add_signal_handler was called for each signal
+    if hasattr(signal, "SIGTERM"):  # Check for POSIX signals
+        assert mock_loop.add_signal_handler.call_count >= 1
+    else:  # Windows
+        mock_loop.add_signal_handler.assert_called_once()
 
 
+# Function-scoped loop, since this test patches the asyncio loop functions
 @pytest.mark.asyncio
-async def test_shutdown_function():
+async def test_shutdown_function(monkeypatch):
     """
     Test that the shutdown function properly triggers cleanup process.
 
@@ -703,44 +700,44 @@ async def test_shutdown_function():
     1. In an async context, cleanup_resources is called as a task
     2. In a non-async context, a new event loop is created
     3. Cleanup is properly called in both cases
+
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
     """
-    # Test case 1: With running loop (async context)
-    with (
-        patch("asyncio.get_running_loop") as mock_get_loop,
-        patch("asyncio.create_task") as mock_create_task,
-        patch("mcp_server_troubleshoot.server.cleanup_resources"),
-    ):
+    monkeypatch.setattr(srv, "cleanup_resources", Mock())
 
-        mock_loop = Mock()
-        mock_get_loop.return_value = mock_loop
-        mock_loop.is_closed.return_value = False
+    # Test case 1: With running loop (async context)
+    mock_loop = Mock()
+    mock_loop.is_closed.return_value = False
+    monkeypatch.setattr(srv.asyncio, "get_running_loop", Mock(return_value=mock_loop))
+    mock_create_task = Mock()
+    monkeypatch.setattr(srv.asyncio, "create_task", mock_create_task)
 
-        # Call shutdown
-        shutdown()
+    # Call shutdown
+    shutdown()
 
-        # Verify create_task was called
-        mock_create_task.assert_called_once()
+    # Verify create_task was called
+    mock_create_task.assert_called_once()
 
     # Test case 2: Without running loop (non-async context)
-    with (
-        patch("asyncio.get_running_loop", side_effect=RuntimeError("No running loop")),
-        patch("asyncio.new_event_loop") as mock_new_loop,
-        patch("asyncio.set_event_loop") as mock_set_loop,
-        patch("mcp_server_troubleshoot.server.cleanup_resources"),
-    ):
-
-        mock_loop = Mock()
-        mock_new_loop.return_value = mock_loop
+    monkeypatch.setattr(
+        srv.asyncio, "get_running_loop", Mock(side_effect=RuntimeError("No running loop"))
+    )
+    mock_loop = Mock()
+    mock_new_loop = Mock(return_value=mock_loop)
+    monkeypatch.setattr(srv.asyncio, "new_event_loop", mock_new_loop)
+    mock_set_loop = Mock()
+    monkeypatch.setattr(srv.asyncio, "set_event_loop", mock_set_loop)
 
-        # Call shutdown
-        shutdown()
+    # Call shutdown
+    shutdown()
 
-        # Verify new_event_loop and set_event_loop were called
-        mock_new_loop.assert_called_once()
-        mock_set_loop.assert_called_once_with(mock_loop)
+    # Verify new_event_loop and set_event_loop were called
+    mock_new_loop.assert_called_once()
+    mock_set_loop.assert_called_once_with(mock_loop)
 
-        # Verify run_until_complete was called
-        mock_loop.run_until_complete.assert_called_once()
+    # Verify run_until_complete was called
+    mock_loop.run_until_complete.assert_called_once()
 
-        # Verify loop was closed
-        mock_loop.close.assert_called_once()
+    # Verify loop was closed
+    mock_loop.close.assert_called_once()
@@ -7,11 +7,67 @@ This is a minimal script to diagnose issues with the MCP server's JSON-RPC imple
 
 import json
 import os
+import selectors
 import subprocess
 import sys
 import time
 
 
+def read_response(process, timeout):
+    """
+    Read one line from the server's stdout, echoing its stderr meanwhile.
+
+    Both pipes are non-blocking and served by a single selector, so a server
+    that writes a partial line cannot block the read past the timeout.
+
+    Args:
+        process: The server process, started with stdout and stderr pipes
+        timeout: Seconds to wait for a complete line
+
+    Returns:
+        The line without its newline, whatever was read if stdout closed first,
+        or None on timeout
+    """
+    buffers = {process.stdout: bytearray(), process.stderr: bytearray()}
+    selector = selectors.DefaultSelector()
+    for stream in buffers:
+        os.set_blocking(stream.fileno(), False)
+        selector.register(stream, selectors.EVENT_READ)
+
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+
+            for key, _ in selector.select(remaining):
+                buffer = buffers[key.fileobj]
+                chunk = os.read(key.fd, 65536)
+
+                if key.fileobj is process.stderr:
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        continue
+                    buffer += chunk
+                    *lines, rest = buffer.split(b"\n")
+                    for line in lines:
+                        print(f"STDERR: {line.decode('utf-8', errors='replace').strip()}")
+                    buffer[:] = rest
+                    continue
+
+                if not chunk:
+                    return bytes(buffer)
+                # Only the new chunk can hold the newline, so large responses
+                # arriving in many chunks are scanned once
+                newline = chunk.find(b"\n")
+                if newline != -1:
+                    return bytes(buffer + chunk[:newline])
+                buffer += chunk
+    finally:
+        selector.close()
+
+
 def main():
     """Run a minimal test of the MCP server."""
     print("Starting debug MCP test")
@@ -32,54 +88,33 @@ def main():
         bufsize=0,
     )
 
-    # Start a thread to read stderr in the background
-    import threading
-
-    def read_stderr():
-        while True:
-            line = process.stderr.readline()
-            if not line:
-                break
-            print(f"STDERR: {line.decode('utf-8', errors='replace').strip()}")
-
-    stderr_thread = threading.Thread(target=read_stderr)
-    stderr_thread.daemon = True
-    stderr_thread.start()
-
-    # Wait for server to start
-    print("Waiting for server to start...")
-    time.sleep(2)
-
     try:
-        # Send a simple request
+        # Send a simple request straight away; the pipe holds it until the
+        # server starts reading stdin
         request = {"jsonrpc": "2.0", "id": "1", "method": "get_tool_definitions", "params": {}}
 
         request_str = json.dumps(request) + "\n"
         print(f"Sending request: {request_str.strip()}")
 
         # Write the request to stdin and flush
-        process.stdin.write(request_str.encode("utf-8"))
-        process.stdin.flush()
-
-        # Set a timeout for the read operation
-        import select
-
-        timeout = 10  # seconds
-
-        # Use select to wait for data or timeout
-        ready, _, _ = select.select([process.stdout], [], [], timeout)
-        if not ready:
+        try:
+            process.stdin.write(request_str.encode("utf-8"))
+            process.stdin.flush()
+        except BrokenPipeError:
+            print("ERROR: Server exited before the request could be sent")
+            return
+
+        response_line = read_response(process, timeout=10)
+        if response_line is None:
             print("ERROR: Timeout waiting for response")
         else:
-            # Read the response
-            response_line = process.stdout.readline()
             print(f"Raw response: {response_line}")
 
             if response_line:
                 try:
-                    response = json.loads(response_line.decode("utf-8"))
+                    response = json.loads(response_line)
                     print(f"Received JSON-RPC response: {json.dumps(response, indent=2)}")
-                except json.JSONDecodeError as e:
+                except (json.JSONDecodeError, UnicodeDecodeError) as e:
                     print(f"Failed to decode response as JSON: {e}")
             else:
                 print("No response received (empty)")